@@ -0,0 +1,120 @@
+"""
+Field extraction regex latency on large inputs
+
+Compares extract_batch_year, extract_experience and clean_ocr_text, which
+use patterns compiled once and a single case-folded copy of the text,
+against the previous per-call implementations (one text.lower() and one
+re.IGNORECASE search per pattern, ten str.replace passes) on synthetic
+resumes of growing size. The no-match inputs have every year and
+experience phrase removed, so each pattern scans the whole text.
+
+Run from the backend directory:
+    python -m benchmarks.bench_field_patterns
+"""
+
+import argparse
+import random
+import re
+import statistics
+import time
+
+from benchmarks.corpus import resume_text
+from utils.extractor import extract_batch_year, extract_experience, get_section_text
+from utils.image_reader import clean_ocr_text
+
+LEGACY_BATCH_YEAR_PATTERNS = [
+    r'batch of (20\d{2})', r'class of (20\d{2})', r'(20\d{2})\s*graduate', r'graduating\s*in\s*(20\d{2})',
+    r'expected graduation:?\s*(20\d{2})', r'graduation year:?\s*(20\d{2})', r'b\.?tech\.?\s*\(?\s*(20\d{2})',
+    r'b\.?e\.?\s*\(?\s*(20\d{2})', r'completed in (20\d{2})', r'passed.{1,20}?(20\d{2})', r'degree.{1,30}?(20\d{2})',
+    r'education.{1,50}?(20\d{2})', r'graduated.{1,20}(20\d{2})', r'passing.{1,20}(20\d{2})', r'\b(20\d{2})\b',
+]
+
+LEGACY_OCR_REPLACEMENTS = {
+    '|': 'I', '{': '(', '}': ')', '@': 'a', '$': 'S',
+    '0': 'O', '[': '(', ']': ')', '<': '(', '>': ')',
+}
+
+
+def legacy_batch_year(text):
+    for pattern in LEGACY_BATCH_YEAR_PATTERNS:
+        match = re.search(pattern, text.lower(), re.IGNORECASE)
+        if match:
+            return match.group(1)
+    education_section = get_section_text(text, "EDUCATION")
+    if education_section:
+        years = re.findall(r'\b(20\d{2})\b', education_section)
+        if years:
+            return max(years)
+    return None
+
+
+def legacy_experience(text):
+    exp_match = re.search(r'(\d+)\+?\s*(years|yrs)', text, re.IGNORECASE)
+    if exp_match:
+        return int(exp_match.group(1))
+    if "fresher" in text.lower():
+        return 0
+    return 0
+
+
+def legacy_clean_ocr_text(text):
+    for old, new in LEGACY_OCR_REPLACEMENTS.items():
+        text = text.replace(old, new)
+    text = re.sub(r'\s+', ' ', text)
+    text = ''.join(c for c in text if c.isprintable() or c.isspace())
+    return text.strip()
+
+
+def without_matches(text):
+    """The same text with nothing for the batch year or experience patterns to find"""
+    text = re.sub(r'\d', 'x', text)
+    return re.sub(r'years|yrs|fresher', 'terms', text, flags=re.IGNORECASE)
+
+
+def ocr_noise(rng, text, rate=0.02):
+    """Sprinkle the characters clean_ocr_text repairs through the text"""
+    noisy = list(text)
+    for index in rng.sample(range(len(noisy)), int(len(noisy) * rate)):
+        noisy[index] = rng.choice('|{}@$0[]<>')
+    return ''.join(noisy)
+
+
+def timed(fn, text, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(text)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 10, 100, 500])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    functions = [
+        ('batch_year', extract_batch_year, legacy_batch_year),
+        ('experience', extract_experience, legacy_experience),
+        ('clean_ocr_text', clean_ocr_text, legacy_clean_ocr_text),
+    ]
+    print(f"{'field':<16}{'input':<10}{'pages':>6}{'chars':>10}{'current ms':>12}{'legacy ms':>11}{'speedup':>9}")
+    for pages in args.pages:
+        text = resume_text(rng, pages)
+        inputs = {'match': text, 'no-match': without_matches(text)}
+        for field, current, legacy in functions:
+            for label, field_text in inputs.items():
+                if field == 'clean_ocr_text':
+                    field_text = ocr_noise(rng, field_text)
+                current_ms, current_result = timed(current, field_text, args.repeat)
+                legacy_ms, legacy_result = timed(legacy, field_text, args.repeat)
+                assert current_result == legacy_result, f"{field} disagrees with the legacy implementation"
+                print(f"{field:<16}{label:<10}{pages:>6}{len(field_text):>10}"
+                      f"{current_ms:>12.2f}{legacy_ms:>11.2f}{legacy_ms / current_ms:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Image decode + preprocessing latency per stage
+
+Compares the previous path (full-size color decode, then grayscale and
+resize) with decode_image(grayscale=True), which decodes straight to a
+single channel and lets libjpeg downscale large photos while decoding.
+No Tesseract needed.
+
+Run from the backend directory:
+    python -m benchmarks.bench_image_preprocess
+    python -m benchmarks.bench_image_preprocess --images path/to/sample_images
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from utils.image_reader import decode_image, preprocess_image
+
+
+def synthetic_photo(width, height):
+    """JPEG bytes of a text-covered page at a phone-camera resolution"""
+    image = np.full((height, width, 3), 235, dtype=np.uint8)
+    scale = width / 1400
+    for y in range(int(80 * scale), height, int(45 * scale)):
+        cv2.putText(image, "python java sql docker machine learning engineer", (int(40 * scale), y),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.9 * scale, (20, 20, 20), max(1, int(2 * scale)), cv2.LINE_AA)
+    return cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def legacy_decode(data):
+    return cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def run(decode, data, repeat):
+    totals, stages = [], {}
+    for _ in range(repeat):
+        timings = {}
+        start = time.perf_counter()
+        image = decode(data)
+        timings['decode'] = time.perf_counter() - start
+        preprocess_image(image, timings)
+        totals.append(sum(timings.values()))
+        for stage, seconds in timings.items():
+            stages.setdefault(stage, []).append(seconds)
+    return statistics.median(totals), {stage: statistics.median(values) for stage, values in stages.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', help='Directory of sample images (default: synthetic photos)')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.images:
+        samples = [(name, open(os.path.join(args.images, name), 'rb').read())
+                   for name in sorted(os.listdir(args.images))]
+    else:
+        samples = [(f"{w}x{h}", synthetic_photo(w, h)) for w, h in [(1200, 1600), (3024, 4032), (6000, 8000)]]
+
+    variants = [('color', legacy_decode), ('grayscale', lambda data: decode_image(data, grayscale=True))]
+    for name, data in samples:
+        for label, decode in variants:
+            total, stages = run(decode, data, args.repeat)
+            detail = ' '.join(f"{stage}={seconds * 1000:.1f}" for stage, seconds in stages.items())
+            print(f"{name:>12} {label:>10} {total * 1000:8.1f} ms  ({detail})")
+
+
+if __name__ == '__main__':
+    main()
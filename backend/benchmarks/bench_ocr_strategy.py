@@ -0,0 +1,94 @@
+"""
+OCR strategy latency vs quality
+
+Runs every OCR_STRATEGY of utils.image_reader over a set of images and
+reports per-image latency, mean word confidence and text length. For the
+built-in synthetic resumes (known text) it also reports word recall.
+
+Requires Tesseract. Run from the backend directory:
+    python -m benchmarks.bench_ocr_strategy
+    python -m benchmarks.bench_ocr_strategy --images path/to/sample_images
+"""
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+import cv2
+import numpy as np
+
+from utils.image_reader import preprocess_image, run_ocr, setup_tesseract
+
+STRATEGIES = ['longest', 'concurrent', 'confidence']
+
+WORDS = ('python java sql docker kubernetes react machine learning data analysis '
+         'education experience skills projects university bachelor engineer developer '
+         'designed implemented deployed pipeline dashboard testing agile').split()
+
+
+def synthetic_resume(rng, lines=25, noise=0.0, scale=0.9):
+    """White page with random resume-like lines; optional Gaussian noise to lower confidence"""
+    text_lines = [' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))) for _ in range(lines)]
+    image = np.full((60 + 40 * lines, 1400), 255, dtype=np.uint8)
+    for i, line in enumerate(text_lines):
+        cv2.putText(image, line, (40, 60 + 40 * i), cv2.FONT_HERSHEY_SIMPLEX, scale, 0, 2, cv2.LINE_AA)
+    if noise:
+        noisy = image.astype(np.float32) + np.random.default_rng(rng.randint(0, 10**6)).normal(0, noise, image.shape)
+        image = np.clip(noisy, 0, 255).astype(np.uint8)
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR), ' '.join(text_lines)
+
+
+def word_recall(expected, actual):
+    expected_words = expected.lower().split()
+    actual_words = set(actual.lower().split())
+    return sum(word in actual_words for word in expected_words) / max(len(expected_words), 1)
+
+
+def load_images(args):
+    if args.images:
+        for name in sorted(os.listdir(args.images)):
+            image = cv2.imread(os.path.join(args.images, name))
+            if image is not None:
+                yield name, image, None
+        return
+    rng = random.Random(args.seed)
+    for i in range(args.count):
+        # Alternate clean and noisy pages so the confidence fallback gets exercised
+        noise = 0.0 if i % 2 == 0 else args.noise
+        image, text = synthetic_resume(rng, noise=noise)
+        yield f"synthetic-{i}{'-noisy' if noise else ''}", image, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--images', help='Directory of sample images (default: synthetic resumes)')
+    parser.add_argument('--count', type=int, default=6, help='Number of synthetic images')
+    parser.add_argument('--noise', type=float, default=60.0, help='Noise level of the noisy synthetic images')
+    parser.add_argument('--threshold', type=float, default=None, help='Override OCR_CONFIDENCE_THRESHOLD')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if not setup_tesseract():
+        raise SystemExit("Tesseract is required for this benchmark")
+
+    samples = [(name, preprocess_image(image), text) for name, image, text in load_images(args)]
+    print(f"{'strategy':>11} {'median ms':>10} {'mean ms':>9} {'conf':>6} {'chars':>7} {'recall':>7}")
+    for strategy in STRATEGIES:
+        latencies, confidences, lengths, recalls = [], [], [], []
+        for name, image, expected in samples:
+            start = time.perf_counter()
+            text, confidence = run_ocr(image, strategy=strategy, threshold=args.threshold)
+            latencies.append((time.perf_counter() - start) * 1000)
+            confidences.append(confidence)
+            lengths.append(len(text))
+            if expected is not None:
+                recalls.append(word_recall(expected, text))
+        recall = f"{statistics.mean(recalls):.3f}" if recalls else "-"
+        print(f"{strategy:>11} {statistics.median(latencies):>10.0f} {statistics.mean(latencies):>9.0f} "
+              f"{statistics.mean(confidences):>6.1f} {statistics.mean(lengths):>7.0f} {recall:>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+PDF text layer throughput per backend
+
+Compares PyPDF2 alone, pdfplumber alone and the routed extract_pdf_pages
+(PyPDF2 first, pdfplumber only for pages failing the layout check) on a
+directory of resume PDFs, or on generated PDFs when no corpus is given.
+OCR is disabled so only the text layer backends are measured.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_backends --corpus path/to/resumes
+"""
+
+import argparse
+import random
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+
+from benchmarks.corpus import WORDS, make_text_pdf
+from utils.pdf_reader import TEXT_BACKENDS, extract_pdf_pages
+
+
+def synthetic_corpus(rng, documents, glyph_share):
+    """Two-page resumes; glyph_share of them use glyph-positioned text"""
+    corpus = []
+    for _ in range(documents):
+        pages = [[' '.join(rng.choice(WORDS) for _ in range(12)) for _ in range(45)] for _ in range(2)]
+        corpus.append(make_text_pdf(pages, glyph_positioned=rng.random() < glyph_share))
+    return corpus
+
+
+def run_backend(name, corpus):
+    read_pages = TEXT_BACKENDS[name]
+    timings, pages = [], 0
+    for data in corpus:
+        start = time.perf_counter()
+        pages += len(read_pages(data))
+        timings.append(time.perf_counter() - start)
+    return timings, pages, Counter({name: pages})
+
+
+def run_routed(corpus):
+    timings, pages, usage = [], 0, Counter()
+    for data in corpus:
+        start = time.perf_counter()
+        result = extract_pdf_pages(data, try_ocr=False)
+        timings.append(time.perf_counter() - start)
+        pages += len(result)
+        usage.update(page['backend'] for page in result)
+    return timings, pages, usage
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", help="Directory of PDFs; synthetic resumes are generated if omitted")
+    parser.add_argument("--documents", type=int, default=40, help="Synthetic documents to generate")
+    parser.add_argument("--glyph-share", type=float, default=0.1,
+                        help="Share of synthetic documents with glyph-positioned text")
+    args = parser.parse_args()
+
+    if args.corpus:
+        corpus = [path.read_bytes() for path in sorted(Path(args.corpus).glob("*.pdf"))]
+    else:
+        corpus = synthetic_corpus(random.Random(0), args.documents, args.glyph_share)
+    print(f"{len(corpus)} documents\n")
+
+    print(f"{'backend':<12}{'docs/s':>10}{'pages/s':>10}{'p50 ms':>10}{'max ms':>10}  pages by backend")
+    runs = [(name, lambda name=name: run_backend(name, corpus)) for name in TEXT_BACKENDS]
+    runs.append(("routed", lambda: run_routed(corpus)))
+    for label, run in runs:
+        timings, pages, usage = run()
+        total = sum(timings)
+        print(f"{label:<12}{len(corpus) / total:>10.1f}{pages / total:>10.1f}"
+              f"{statistics.median(timings) * 1000:>10.1f}{max(timings) * 1000:>10.1f}  {dict(usage)}")
+
+
+if __name__ == "__main__":
+    main()
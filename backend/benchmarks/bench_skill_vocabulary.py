@@ -0,0 +1,108 @@
+"""
+Skill matching latency as the vocabulary grows
+
+Compares the indexed SkillVocabulary lookups used by extract_skills
+(automaton pass for approaches 2/3, substring index for approach 4)
+against the previous per-skill linear scans on synthetic vocabularies.
+
+Run from the backend directory:
+    python -m benchmarks.bench_skill_vocabulary
+"""
+
+import argparse
+import random
+import re
+import statistics
+import string
+import time
+
+from utils.skill_matcher import has_word_boundaries
+from utils.skill_vocabulary import SkillVocabulary
+
+STOP_WORDS = {'a', 'an', 'and', 'in', 'of', 'on', 'or', 'the', 'to', 'with'}
+
+
+def make_word(rng):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(2, 9)))
+
+
+def make_vocabulary(rng, size):
+    """Synthetic skill names of one to three words"""
+    skills = set()
+    while len(skills) < size:
+        skills.add(' '.join(make_word(rng) for _ in range(rng.randint(1, 3))).title())
+    return sorted(skills)
+
+
+def make_resume(rng, skills, words=800):
+    """Filler text with a few dozen real skills sprinkled in"""
+    tokens = [make_word(rng) for _ in range(words)]
+    for skill in rng.sample(skills, min(40, len(skills))):
+        tokens.insert(rng.randrange(len(tokens)), skill)
+    return ' '.join(tokens)
+
+
+def indexed_match(vocabulary, text_lower, entities):
+    found = set()
+    for end, (pattern, candidates) in vocabulary.automaton.iter(text_lower):
+        for original, needs_boundary in candidates:
+            if needs_boundary and not has_word_boundaries(text_lower, end - len(pattern) + 1, end + 1):
+                continue
+            found.add(original)
+    for ent in entities:
+        found.update(vocabulary.related_skills(ent))
+    return found
+
+
+def linear_match(skills_dict, text_lower, entities):
+    found = set()
+    for skill, original in skills_dict.items():
+        if len(skill) <= 1:
+            continue
+        if len(skill) <= 3 or skill in STOP_WORDS:
+            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
+                found.add(original)
+        elif skill in text_lower:
+            found.add(original)
+    for ent in entities:
+        for skill, original in skills_dict.items():
+            if skill == ent or skill in ent or ent in skill:
+                found.add(original)
+    return found
+
+
+def timed(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[250, 1000, 5000, 10000, 20000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'skills':>8} {'build ms':>10} {'indexed ms':>11} {'linear ms':>10}")
+    for size in args.sizes:
+        skills = make_vocabulary(rng, size)
+        start = time.perf_counter()
+        vocabulary = SkillVocabulary(skills, stop_words=STOP_WORDS)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        text_lower = make_resume(rng, skills).lower()
+        entities = [skill.lower() for skill in rng.sample(skills, 30)] + [make_word(rng) for _ in range(30)]
+
+        indexed_ms, indexed = timed(lambda: indexed_match(vocabulary, text_lower, entities), args.repeat)
+        linear_ms, linear = timed(lambda: linear_match(vocabulary.lookup, text_lower, entities), args.repeat)
+        assert indexed == linear, "indexed and linear matching disagree"
+        print(f"{size:>8} {build_ms:>10.1f} {indexed_ms:>11.2f} {linear_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
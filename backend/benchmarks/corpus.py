@@ -0,0 +1,155 @@
+"""
+Synthetic resume corpus for the benchmarks
+
+Everything is generated from a seed, so runs on different machines measure
+the same inputs: resume text, text-layer PDFs, scanned (image-only) PDFs and
+PNG photos of a page. Only numpy and OpenCV are needed; no PDF library.
+"""
+
+import cv2
+import numpy as np
+
+WORDS = (
+    "python java sql docker kubernetes react machine learning data analysis "
+    "developed built implemented designed led team project university bachelor "
+    "engineer intern experience skills education pandas tensorflow aws git"
+).split()
+
+SKILLS = [
+    "Python", "Java", "SQL", "Docker", "Kubernetes", "React", "Machine Learning",
+    "Data Analysis", "Pandas", "TensorFlow", "AWS", "Git", "JavaScript", "Node.js",
+    "PostgreSQL", "MongoDB", "Flask", "Django", "Tableau", "Power BI", "Linux",
+    "C++", "Excel", "Deep Learning", "NLP", "Spark", "Hadoop", "Azure", "Figma",
+]
+
+# Page sizes in pixels: A4 at 150 and 300 DPI, and a 12 MP phone photo
+IMAGE_SIZES = {
+    'a4-150dpi': (1240, 1754),
+    'a4-300dpi': (2480, 3508),
+    'photo-12mp': (3024, 4032),
+}
+
+
+def resume_lines(rng, lines=45):
+    """Resume-like lines with the usual section headings, a batch year and experience"""
+    body = [
+        "EDUCATION",
+        f"Bachelor of Technology, Computer Science, University of Delhi, {rng.randint(2015, 2024)}",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 12)),
+        "EXPERIENCE",
+        f"Software Engineer, {rng.randint(1, 9)} years of experience building data pipelines",
+        "PROJECTS",
+    ]
+    while len(body) < lines:
+        body.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 13))).capitalize())
+    return body[:lines]
+
+
+def resume_text(rng, pages=1):
+    return '\n'.join(line for _ in range(pages) for line in resume_lines(rng))
+
+
+def pdf_string(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(page_streams, resources, extra_objects=()):
+    """
+    Serialize a minimal PDF
+
+    Args:
+        page_streams: Content stream bytes, one per page
+        resources: Resource dictionary source per page, with {n} standing for the
+            object number of that page's entry in extra_objects (if any)
+        extra_objects: Per-page extra object bytes (e.g. an image XObject) or None
+    """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for index, stream in enumerate(page_streams):
+        extra = extra_objects[index] if extra_objects else None
+        extra_id = None
+        if extra is not None:
+            objects.append(extra)
+            extra_id = len(objects)
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        contents_id = len(objects)
+        page_resources = resources.format(n=extra_id).encode()
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources "
+                       + page_resources + b" /Contents %d 0 R >>" % contents_id)
+        page_ids.append(len(objects))
+    kids = ' '.join(f'{i} 0 R' for i in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+
+def make_text_pdf(pages, glyph_positioned=False):
+    """
+    Text-layer PDF with one content stream per page
+
+    Args:
+        pages: List of pages, each a list of text lines
+        glyph_positioned: Place every character separately, as some resume
+            builders do; fast extractors lose the word spacing on such pages
+    """
+    streams = []
+    for lines in pages:
+        ops = ["BT", "/F1 11 Tf"]
+        for row, line in enumerate(lines):
+            y = 760 - 14 * row
+            if glyph_positioned:
+                for col, ch in enumerate(line):
+                    if ch != ' ':
+                        ops.append(f"1 0 0 1 {50 + 6 * col} {y} Tm ({pdf_string(ch)}) Tj")
+            else:
+                ops.append(f"1 0 0 1 50 {y} Tm ({pdf_string(line)}) Tj")
+        ops.append("ET")
+        streams.append("\n".join(ops).encode("latin-1"))
+    return write_pdf(streams, "<< /Font << /F1 3 0 R >> >>")
+
+
+def render_page(lines, size, noise=0.0, seed=0):
+    """Grayscale page image with the lines typeset on it"""
+    width, height = size
+    image = np.full((height, width), 250, dtype=np.uint8)
+    scale = width / 1240
+    line_height = max(int(36 * scale), 1)
+    for row, line in enumerate(lines):
+        y = int(80 * scale) + row * line_height
+        if y > height - line_height:
+            break
+        cv2.putText(image, line, (int(60 * scale), y), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.75 * scale, 20, max(1, int(2 * scale)), cv2.LINE_AA)
+    if noise:
+        noisy = image.astype(np.float32) + np.random.default_rng(seed).normal(0, noise, image.shape)
+        image = np.clip(noisy, 0, 255).astype(np.uint8)
+    return image
+
+
+def make_scanned_pdf(pages, size=IMAGE_SIZES['a4-150dpi'], quality=80):
+    """Image-only PDF: every page is a JPEG scan with no text layer"""
+    streams, images = [], []
+    for lines in pages:
+        jpeg = cv2.imencode('.jpg', render_page(lines, size), [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes()
+        images.append(b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                      b"/BitsPerComponent 8 /Filter /DCTDecode /Length %d >>\nstream\n" % (size[0], size[1], len(jpeg))
+                      + jpeg + b"\nendstream")
+        streams.append(b"q 612 0 0 792 0 0 cm /Im1 Do Q")
+    return write_pdf(streams, "<< /XObject << /Im1 {n} 0 R >> >>", images)
+
+
+def make_png(lines, size, noise=8.0, seed=0):
+    """PNG 'photo' of a resume page, with mild sensor noise"""
+    return cv2.imencode('.png', render_page(lines, size, noise=noise, seed=seed))[1].tobytes()
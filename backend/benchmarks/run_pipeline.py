@@ -0,0 +1,313 @@
+"""
+End-to-end benchmark suite for the resume -> recommendation pipeline
+
+Every case runs in a fresh spawned process so its peak RSS is its own, on
+a synthetic corpus generated from a fixed seed (see benchmarks/corpus.py):
+
+    extract_text_from_pdf     text-layer PDFs (1/3/8 pages), scanned PDFs (1/3 pages)
+    extract_text_from_image   PNG pages at A4 150/300 DPI and a 12 MP photo
+    process_resume            resume text of 1/3/8 pages
+    recommend_jobs            5/15/40 skills
+    /upload-resume            in-process TestClient, cold (new bytes) and cached
+
+Each case reports throughput, p50/p95/p99/mean latency and peak RSS; cases
+whose dependencies are missing (Tesseract, poppler, the spaCy model) are
+reported as skipped or failed rather than aborting the run. Results are
+written as JSON and compared with a stored baseline; the exit status is 1
+when a case regressed beyond the tolerances, or failed or was skipped
+although it ran fine in the baseline.
+
+Run from the backend directory:
+    python -m benchmarks.run_pipeline --output results.json
+    python -m benchmarks.run_pipeline --save-baseline
+    python -m benchmarks.run_pipeline --baseline benchmarks/baseline.json --only recommend_jobs
+
+Baselines are machine-specific: latency and RSS only compare between runs
+on the same hardware, so benchmarks/baseline.json is a local file and is not
+committed. Without --baseline, a missing default baseline only prints a note
+and exits 0. Naming a baseline with --baseline, or passing
+--require-baseline, turns a missing file into an error (exit status 2)
+before any case runs, so a CI job cannot pass silently without comparing.
+
+In CI, keep one baseline per runner type outside the repository, e.g. in
+the CI cache or as a build artifact keyed by the runner image:
+    # once, on the main branch, whenever the runner type or a tolerance changes
+    python -m benchmarks.run_pipeline --save-baseline --baseline $BASELINE_DIR/pipeline-$RUNNER.json
+    # on every change
+    python -m benchmarks.run_pipeline --baseline $BASELINE_DIR/pipeline-$RUNNER.json --require-baseline
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+SEED = 1234
+
+# name, target, input kind, size, iterations per input, inputs
+CASES = [
+    ("extract_text_from_pdf[text-1p]", "pdf", "text_pdf", 1, 10, 5),
+    ("extract_text_from_pdf[text-3p]", "pdf", "text_pdf", 3, 5, 5),
+    ("extract_text_from_pdf[text-8p]", "pdf", "text_pdf", 8, 3, 5),
+    ("extract_text_from_pdf[scanned-1p]", "pdf", "scanned_pdf", 1, 2, 2),
+    ("extract_text_from_pdf[scanned-3p]", "pdf", "scanned_pdf", 3, 1, 2),
+    ("extract_text_from_image[a4-150dpi]", "image", "png", "a4-150dpi", 2, 2),
+    ("extract_text_from_image[a4-300dpi]", "image", "png", "a4-300dpi", 2, 2),
+    ("extract_text_from_image[photo-12mp]", "image", "png", "photo-12mp", 1, 2),
+    ("process_resume[1p]", "process_resume", "text", 1, 10, 5),
+    ("process_resume[3p]", "process_resume", "text", 3, 5, 5),
+    ("process_resume[8p]", "process_resume", "text", 8, 3, 5),
+    ("recommend_jobs[5-skills]", "recommend", "skills", 5, 50, 10),
+    ("recommend_jobs[15-skills]", "recommend", "skills", 15, 50, 10),
+    ("recommend_jobs[40-skills]", "recommend", "skills", 40, 50, 10),
+    ("upload_resume[text-1p-cold]", "upload", "text_pdf", 1, 5, 5),
+    ("upload_resume[text-1p-cached]", "upload_cached", "text_pdf", 1, 20, 5),
+    ("upload_resume[png-a4-150dpi-cold]", "upload", "png", "a4-150dpi", 1, 2),
+]
+
+# External programs each input kind needs
+REQUIRED_PROGRAMS = {
+    "scanned_pdf": ["pdftoppm", "tesseract"],
+    "png": ["tesseract"],
+}
+
+
+def make_inputs(kind, size, count):
+    """Deterministic inputs of one kind; returns (inputs, file extension)"""
+    from benchmarks.corpus import (IMAGE_SIZES, SKILLS, make_png, make_scanned_pdf,
+                                   make_text_pdf, resume_lines, resume_text)
+
+    rng = random.Random(f"{SEED}-{kind}-{size}")
+    if kind == "text_pdf":
+        return [make_text_pdf([resume_lines(rng) for _ in range(size)]) for _ in range(count)], ".pdf"
+    if kind == "scanned_pdf":
+        return [make_scanned_pdf([resume_lines(rng) for _ in range(size)]) for _ in range(count)], ".pdf"
+    if kind == "png":
+        return [make_png(resume_lines(rng), IMAGE_SIZES[size], seed=i) for i in range(count)], ".png"
+    if kind == "text":
+        return [resume_text(rng, pages=size) for _ in range(count)], None
+    if kind == "skills":
+        pool = SKILLS + [word.title() for word in resume_text(rng).split()[:200]]
+        return [rng.sample(pool, size) for _ in range(count)], None
+    raise ValueError(f"Unknown input kind: {kind}")
+
+
+def unique_copy(data, extension, counter):
+    """Same document with different bytes, so the parse cache cannot serve it"""
+    # Both PDF readers and image decoders ignore bytes after the end of the file
+    suffix = f"\n%{counter}\n" if extension == ".pdf" else f"nonce{counter}"
+    return data + suffix.encode()
+
+
+def build_target(target, extension):
+    """Function of one input to time, after any setup the case needs"""
+    if target == "pdf":
+        from utils.pdf_reader import extract_text_from_pdf
+        return extract_text_from_pdf
+    if target == "image":
+        from utils.image_reader import extract_text_from_image
+        return extract_text_from_image
+    if target == "process_resume":
+        from utils.extractor import process_resume
+        return process_resume
+    if target == "recommend":
+        from utils.recommender import JobIndex, RecommenderEngine, recommend_jobs
+        engine = RecommenderEngine(JobIndex.from_csv(BACKEND_DIR / "job_skill_dataset.csv"))
+        return lambda skills: recommend_jobs(skills, engine)
+    if target in ("upload", "upload_cached"):
+        # Run the pipeline in a thread of this process instead of a worker pool
+        os.environ["PARSER_WORKERS"] = "0"
+        from fastapi.testclient import TestClient
+        import main
+        client = TestClient(main.app)
+        client.__enter__()
+        counter = iter(range(10 ** 9))
+
+        def upload(data):
+            if target == "upload":
+                data = unique_copy(data, extension, next(counter))
+            response = client.post("/upload-resume", files={"file": (f"resume{extension}", data)})
+            if response.status_code != 200:
+                raise RuntimeError(f"/upload-resume returned {response.status_code}: {response.text[:200]}")
+        return upload
+    raise ValueError(f"Unknown target: {target}")
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_case(case, iterations_scale=1.0):
+    """Run one case (in its own process) and return its result dict"""
+    name, target, kind, size, iterations, count = case
+    os.chdir(BACKEND_DIR)
+    # Per-call INFO logs would add I/O to every measured call
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+
+    missing = [program for program in REQUIRED_PROGRAMS.get(kind, []) if shutil.which(program) is None]
+    if missing:
+        return {"status": "skipped", "reason": f"missing programs: {', '.join(missing)}"}
+
+    try:
+        inputs, extension = make_inputs(kind, size, count)
+        fn = build_target(target, extension)
+        # Warm up: model loading and first-call costs are not part of the latency;
+        # the cached upload case also needs every input in the parse cache first
+        for item in (inputs if target == "upload_cached" else inputs[:1]):
+            fn(item)
+
+        latencies = []
+        rounds = max(1, round(iterations * iterations_scale))
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for item in inputs:
+                start = time.perf_counter()
+                fn(item)
+                latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        return {"status": "failed", "reason": f"{type(e).__name__}: {e}"}
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "status": "ok",
+        "calls": len(latencies),
+        "throughput_per_s": round(len(latencies) / elapsed, 3),
+        "mean_ms": round(float(latencies_ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(latencies_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(latencies_ms, 99)), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, latency_tolerance, rss_tolerance):
+    """
+    Regressions of results against baseline
+
+    Returns:
+        List of (case, metric, baseline value, current value) that got worse
+        by more than the tolerance, including cases that were ok in the
+        baseline and no longer are (metric 'status')
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        # Nothing to compare against
+        if not previous or previous.get("status") != "ok":
+            continue
+        # A case that worked in the baseline and now fails or is skipped is the worst regression
+        if current.get("status") != "ok":
+            regressions.append((name, "status", "ok", current.get("status")))
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if current[metric] > previous[metric] * (1 + latency_tolerance):
+                regressions.append((name, metric, previous[metric], current[metric]))
+        if current["throughput_per_s"] < previous["throughput_per_s"] / (1 + latency_tolerance):
+            regressions.append((name, "throughput_per_s", previous["throughput_per_s"], current["throughput_per_s"]))
+        if current["peak_rss_mb"] > previous["peak_rss_mb"] * (1 + rss_tolerance):
+            regressions.append((name, "peak_rss_mb", previous["peak_rss_mb"], current["peak_rss_mb"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="Write results JSON here")
+    parser.add_argument("--baseline",
+                        help=f"Baseline JSON to compare against (default: {DEFAULT_BASELINE.name} next to this "
+                             "script); an explicitly named baseline must exist")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="Fail instead of skipping the comparison when the baseline is missing (for CI)")
+    parser.add_argument("--only", help="Run only cases whose name contains this text")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply the iterations of every case")
+    parser.add_argument("--latency-tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown before a latency/throughput regression is reported")
+    parser.add_argument("--rss-tolerance", type=float, default=0.15,
+                        help="Allowed relative peak RSS growth")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline or DEFAULT_BASELINE)
+    # Checked before running anything: the suite takes minutes
+    if not args.save_baseline and not baseline_path.exists() and (args.baseline or args.require_baseline):
+        parser.error(f"no baseline at {baseline_path}; create it on this machine with --save-baseline")
+
+    cases = [case for case in CASES if not args.only or args.only in case[0]]
+    results = {}
+    print(f"{'case':<40}{'calls':>7}{'per s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'RSS MB':>9}")
+    for case in cases:
+        # A fresh process per case, so peak RSS and model caches do not carry over
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            result = executor.submit(run_case, case, args.scale).result()
+        results[case[0]] = result
+        if result["status"] == "ok":
+            print(f"{case[0]:<40}{result['calls']:>7}{result['throughput_per_s']:>9.1f}{result['p50_ms']:>10.1f}"
+                  f"{result['p95_ms']:>10.1f}{result['p99_ms']:>10.1f}{result['peak_rss_mb']:>9.1f}")
+        else:
+            print(f"{case[0]:<40}  {result['status']}: {result['reason']}")
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": SEED,
+            "scale": args.scale,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2))
+        print(f"\nBaseline saved to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    baseline_meta = baseline.get("meta", {})
+    if (baseline_meta.get("platform"), baseline_meta.get("cpu_count")) != (report["meta"]["platform"], os.cpu_count()):
+        print(f"\nWarning: {baseline_path} was recorded on {baseline_meta.get('platform')} with "
+              f"{baseline_meta.get('cpu_count')} CPUs; timings may not be comparable")
+    regressions = compare(results, baseline, args.latency_tolerance, args.rss_tolerance)
+    if not regressions:
+        print("\nNo regressions against the baseline")
+        return 0
+    print("\nRegressions against the baseline:")
+    for name, metric, before, after in regressions:
+        print(f"  {name}: {metric} {before} -> {after}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
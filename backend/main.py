@@ -1,18 +1,23 @@
 import os
 import json
-from utils.pdf_reader import extract_text_from_pdf
-from utils.image_reader import extract_text_from_image
-from utils.extractor import process_resume
-from utils.recommender import recommend_jobs
-import pandas as pd
+import time
+import logging
+from utils.model_registry import registry
+from utils.recommender import recommend_jobs, recommend_jobs_batch, JobIndex, RecommenderEngine
+from utils.extractor import extractor_version
+from utils.parse_cache import build_parse_cache, content_digest
+from utils.worker_pool import ParserPool, PoolSaturatedError, parse_and_recommend
+from utils.adzuna_client import AdzunaClient
+from utils.search_cache import build_search_cache
+from utils.debug_capture import new_request_id
+from utils.tracing import configure_logging, set_span_sink, span
+from utils.metrics import HTTP_REQUEST_LATENCY, observe_span, observe_spans, count_pdf_pages, render_metrics
 import re
-from fastapi import FastAPI, Query, HTTPException, UploadFile, File
+from fastapi import FastAPI, Query, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-import requests
 from typing import Optional, List, Dict, Any
-import shutil
 from pathlib import Path
 import subprocess
 import sys
@@ -22,6 +27,11 @@ from urllib.parse import quote_plus
 
 load_dotenv()
 
+configure_logging()
+# Spans finished in this process go straight into the stage latency histogram
+set_span_sink(observe_span)
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="Resume Parser API",
     description="API for parsing resumes and recommending jobs",
@@ -37,9 +47,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Create uploads directory if it doesn't exist
-UPLOAD_DIR = Path("uploads")
-UPLOAD_DIR.mkdir(exist_ok=True)
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe every request in the HTTP latency histogram, labelled by route template"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_LATENCY.labels(
+            method=request.method,
+            route=route.path if route is not None else "unmatched",
+            status=str(status)
+        ).observe(time.perf_counter() - start)
+
+# Job skills dataset, indexed once at startup and shared by every request; its
+# compiled artifact (python -m utils.job_dataset) is memory-mapped when current
+DATASET_PATH = Path(__file__).parent / "job_skill_dataset.csv"
 
 # Global variable to track if server is already running
 _server_process = None
@@ -57,6 +84,45 @@ class ResumeResponse(BaseModel):
     extractedInfo: ExtractedInfo
     recommendedJobs: List[JobRecommendation]
 
+class BatchRecommendRequest(BaseModel):
+    skills: List[List[str]]
+    top_n: int = 10
+
+class BatchRecommendResponse(BaseModel):
+    recommendedJobs: List[List[JobRecommendation]]
+
+@app.on_event("startup")
+def load_job_index():
+    """Load the job skills dataset and fit the job vectors once instead of on every upload"""
+    app.state.job_index = JobIndex.load(DATASET_PATH)
+    app.state.recommender = RecommenderEngine(app.state.job_index)
+    app.state.parse_cache = build_parse_cache()
+
+@app.on_event("startup")
+def start_parser_pool():
+    """Start the worker pool that runs the CPU-bound resume pipeline"""
+    app.state.parser_pool = ParserPool(DATASET_PATH)
+
+@app.on_event("shutdown")
+def stop_parser_pool():
+    app.state.parser_pool.shutdown()
+
+@app.on_event("startup")
+async def start_adzuna_client():
+    """Create the shared, connection-pooled Adzuna client with its response cache"""
+    app.state.adzuna = AdzunaClient(cache=build_search_cache())
+
+@app.on_event("shutdown")
+async def stop_adzuna_client():
+    await app.state.adzuna.aclose()
+
+@app.on_event("startup")
+def warmup_models():
+    """Optionally load NLP models before the first request (PRELOAD_MODELS=1)"""
+    if os.getenv("PRELOAD_MODELS", "0") == "1":
+        load_times = registry.warmup()
+        logger.info("Models preloaded", extra={"load_times": load_times})
+
 def allowed_file(filename: str) -> bool:
     """Check if the file type is allowed"""
     ALLOWED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.jpg', '.jpeg', '.png'}
@@ -75,61 +141,29 @@ def job_titles(recommended_jobs, max_titles=10):
 
 
 @app.get("/jobs/search")
-def search_jobs(
+async def search_jobs(
     job_titles: List[str] = Query(...),
     results_per_page: int = 20
 ):
     """
     Fetch jobs from Adzuna using AI-recommended job titles.
     Uses multiple API calls because Adzuna does NOT support OR queries reliably.
+    The calls run concurrently over a shared connection pool.
     """
 
-    print("Job titles received:", job_titles)
+    logger.debug("Job titles received: %s", job_titles)
 
     if not job_titles:
         return {"count": 0, "jobs": []}
 
-    app_id = os.getenv("ADZUNA_APP_ID")
-    app_key = os.getenv("ADZUNA_APP_KEY")
-
-    if not app_id or not app_key:
+    adzuna = app.state.adzuna
+    if not adzuna.has_credentials():
         raise HTTPException(status_code=500, detail="Adzuna credentials missing")
 
-    all_jobs = []
-    seen_job_ids = set()
-
     # Limit calls to top 5 titles to stay within rate limits
-    for title in job_titles[:5]:
-        clean_title = title.strip()
-        if not clean_title:
-            continue
-
-        encoded_title = quote_plus(clean_title)
-
-        url = (
-            f"https://api.adzuna.com/v1/api/jobs/in/search/1"
-            f"?app_id={app_id}"
-            f"&app_key={app_key}"
-            f"&results_per_page={results_per_page}"
-            f"&what={encoded_title}"
-            f"&sort_by=relevance"
-        )
+    all_jobs = await adzuna.search(job_titles[:5], results_per_page)
 
-        try:
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-        except Exception as e:
-            print(f"Adzuna error for '{clean_title}':", e)
-            continue
-
-        for job in data.get("results", []):
-            job_id = job.get("id")
-            if job_id and job_id not in seen_job_ids:
-                seen_job_ids.add(job_id)
-                all_jobs.append(job)
-
-    print(f"Total jobs fetched: {len(all_jobs)}")
+    logger.info("Total jobs fetched: %d", len(all_jobs))
 
     # Format response for frontend
     formatted_jobs = []
@@ -165,64 +199,100 @@ async def upload_resume(file: UploadFile = File(...)):
                 detail="Invalid file type. Allowed types: PDF, DOC, DOCX, JPG, JPEG, PNG"
             )
 
-        # Create a temporary file path
-        temp_file_path = UPLOAD_DIR / file.filename
-        
-        # Save the uploaded file
-        with open(temp_file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-
-        # Extract text based on file type
         file_extension = Path(file.filename).suffix.lower()
-        if file_extension == '.pdf':
-            text = extract_text_from_pdf(str(temp_file_path))
-        elif file_extension in {'.jpg', '.jpeg', '.png'}:
-            text = extract_text_from_image(str(temp_file_path))
-        else:
+        if file_extension not in {'.pdf', '.jpg', '.jpeg', '.png'}:
             raise HTTPException(
                 status_code=400,
                 detail="File type not supported for text extraction"
             )
 
-        if not text:
+        # Repeat uploads of the same file reuse the cached parse result
+        request_id = new_request_id()
+        with span('upload.receive'):
+            contents = await file.read()
+            digest = content_digest(contents)
+        current_extractor = extractor_version()
+        dataset_version = app.state.job_index.version
+        cached = await app.state.parse_cache.lookup(digest, current_extractor)
+        if cached is not None:
+            if cached['dataset_version'] == dataset_version:
+                return {
+                    'extractedInfo': cached['extractedInfo'],
+                    'recommendedJobs': cached['recommendedJobs']
+                }
+            # Only the job dataset changed: skip straight to recommendation
+            with span('recommend'):
+                recommended_jobs = recommend_jobs(cached['extractedInfo']['Skills'], app.state.recommender)
+            output_data = {
+                'extractedInfo': cached['extractedInfo'],
+                'recommendedJobs': recommended_jobs
+            }
+            await app.state.parse_cache.store(digest, cached['extractor_version'], dataset_version, output_data)
+            return output_data
+
+        # Extract text, analyze it and recommend jobs in the worker pool
+        # so the event loop stays free for other requests
+        try:
+            # The upload is parsed from memory; nothing is written to disk
+            with span('upload.parse'):
+                output_data = await app.state.parser_pool.submit(
+                    parse_and_recommend, contents, file_extension, request_id
+                )
+        except PoolSaturatedError:
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy processing other resumes, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+
+        if output_data is None:
             raise HTTPException(
                 status_code=400,
                 detail="Could not extract text from the file"
             )
 
-        # Process the resume
-        info = process_resume(text)
-        
-        # Load job skills dataset
-        df = pd.read_csv("job_skill_dataset.csv")
-        
-        # Get job recommendations
-        recommended_jobs = recommend_jobs(info['Skills'], df)
-        print("Recommended jobs: ", recommended_jobs)
-        # Clean up the uploaded file
-        os.remove(temp_file_path)
-
-        # Prepare response
-        output_data = {
-            'extractedInfo': info,
-            'recommendedJobs': recommended_jobs
-        }
-
+        # Stage timings and PDF backends from the worker
+        spans = output_data.get('spans', [])
+        observe_spans(spans)
+        count_pdf_pages(output_data.get('textBackends', {}))
+        stage_ms = {}
+        for name, seconds in spans:
+            # Per-page spans repeat, so their times add up
+            stage_ms[name] = round(stage_ms.get(name, 0) + seconds * 1000, 1)
+        logger.info("Parsed %s upload", file_extension, extra={
+            'request_id': request_id,
+            'digest': digest[:12],
+            'stage_ms': stage_ms,
+        })
+        # Cache under the version the worker actually parsed with
+        await app.state.parse_cache.store(digest, output_data['extractorVersion'], dataset_version, output_data)
         return output_data
 
     except Exception as e:
-        # Clean up the file in case of error
-        if 'temp_file_path' in locals():
-            try:
-                os.remove(temp_file_path)
-            except:
-                pass
+        # Keep deliberate client errors and backpressure responses as they are
+        if isinstance(e, HTTPException):
+            raise
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/recommend/batch", response_model=BatchRecommendResponse)
+def recommend_batch(request: BatchRecommendRequest):
+    """
+    Score many stored skill lists in one call.
+    All queries are stacked into a single sparse matrix and ranked together.
+    """
+    recommended_jobs = recommend_jobs_batch(request.skills, app.state.recommender, top_n=request.top_n)
+    return {"recommendedJobs": recommended_jobs}
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {"status": "healthy", "models": registry.status()}
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: HTTP and pipeline stage latency histograms, PDF pages per backend"""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
 
 def start_server():
     global _server_process
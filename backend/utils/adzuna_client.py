@@ -0,0 +1,117 @@
+"""
+Async Adzuna job search client
+
+All title searches share one pooled httpx.AsyncClient, so connections and
+TLS sessions are kept alive between calls, and the per-title requests run
+concurrently under a concurrency limit. The base URL is configurable so the
+client can be pointed at a local stub server.
+"""
+
+import asyncio
+import logging
+import os
+
+import httpx
+
+from utils.search_cache import normalize_key
+
+logger = logging.getLogger(__name__)
+
+ADZUNA_BASE_URL = os.getenv("ADZUNA_BASE_URL", "https://api.adzuna.com/v1/api/jobs/in/search/1")
+ADZUNA_TIMEOUT = float(os.getenv("ADZUNA_TIMEOUT", "10"))
+ADZUNA_MAX_CONCURRENCY = int(os.getenv("ADZUNA_MAX_CONCURRENCY", "5"))
+
+
+class AdzunaClient:
+    """
+    Concurrent, connection-pooled Adzuna search
+
+    Args:
+        app_id: Adzuna application id (defaults to ADZUNA_APP_ID)
+        app_key: Adzuna application key (defaults to ADZUNA_APP_KEY)
+        base_url: Search endpoint to call
+        timeout: Per-call timeout in seconds
+        max_concurrency: Maximum number of requests in flight at once
+        client: Optional preconfigured httpx.AsyncClient (e.g. with a mock transport)
+        cache: Optional ResponseCache in front of the per-title requests
+    """
+
+    def __init__(self, app_id=None, app_key=None, base_url=ADZUNA_BASE_URL,
+                 timeout=ADZUNA_TIMEOUT, max_concurrency=ADZUNA_MAX_CONCURRENCY, client=None, cache=None):
+        self.app_id = app_id if app_id is not None else os.getenv("ADZUNA_APP_ID")
+        self.app_key = app_key if app_key is not None else os.getenv("ADZUNA_APP_KEY")
+        self.base_url = base_url
+        self.cache = cache
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+
+    def has_credentials(self):
+        return bool(self.app_id and self.app_key)
+
+    async def _request(self, title, results_per_page):
+        """Call the search endpoint for one title; raises on any failure"""
+        params = {
+            "app_id": self.app_id,
+            "app_key": self.app_key,
+            "results_per_page": results_per_page,
+            "what": title,
+            "sort_by": "relevance",
+        }
+        async with self._semaphore:
+            response = await self._client.get(self.base_url, params=params)
+        response.raise_for_status()
+        return response.json().get("results", [])
+
+    async def fetch_title(self, title, results_per_page=20):
+        """
+        Search Adzuna for a single job title, through the cache if one is configured
+
+        Args:
+            title: Job title to search for
+            results_per_page: Number of results to request
+
+        Returns:
+            List of raw Adzuna job dicts; empty if the call failed
+        """
+        try:
+            if self.cache is None:
+                return await self._request(title, results_per_page)
+            return await self.cache.get_or_fetch(
+                normalize_key(title, results_per_page),
+                lambda: self._request(title, results_per_page)
+            )
+        except Exception as e:
+            logger.warning("Adzuna error for '%s': %s", title, e)
+            return []
+
+    async def search(self, titles, results_per_page=20):
+        """
+        Search several titles concurrently and merge the results
+
+        Args:
+            titles: Job titles to search for; blank titles are skipped
+            results_per_page: Number of results to request per title
+
+        Returns:
+            Raw Adzuna job dicts, deduplicated by id, in title order
+        """
+        clean_titles = [title.strip() for title in titles if title.strip()]
+        results = await asyncio.gather(
+            *(self.fetch_title(title, results_per_page) for title in clean_titles)
+        )
+
+        all_jobs = []
+        seen_job_ids = set()
+        for jobs in results:
+            for job in jobs:
+                job_id = job.get("id")
+                if job_id and job_id not in seen_job_ids:
+                    seen_job_ids.add(job_id)
+                    all_jobs.append(job)
+        return all_jobs
+
+    async def aclose(self):
+        await self._client.aclose()
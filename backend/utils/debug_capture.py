@@ -0,0 +1,169 @@
+"""
+Per-request debug artifacts, off by default
+
+With DEBUG_CAPTURE=1, pipeline stages can hand intermediate results (extracted
+text, preprocessed images) to capture(). They are written by a background
+thread to DEBUG_CAPTURE_DIR/<request id>/<name>, so concurrent requests never
+overwrite each other and the request path never waits on disk I/O. Once the
+directory grows past DEBUG_CAPTURE_MAX_BYTES, the oldest request directories
+are deleted. When capture is disabled, capture() returns immediately.
+"""
+
+import contextvars
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEBUG_CAPTURE = os.getenv("DEBUG_CAPTURE", "0") == "1"
+DEBUG_CAPTURE_DIR = os.getenv("DEBUG_CAPTURE_DIR", os.path.join("output", "debug"))
+DEBUG_CAPTURE_MAX_BYTES = int(os.getenv("DEBUG_CAPTURE_MAX_BYTES", str(100 * 1024 * 1024)))
+# Artifacts waiting to be written; more are dropped rather than blocking a request
+DEBUG_CAPTURE_QUEUE_SIZE = int(os.getenv("DEBUG_CAPTURE_QUEUE_SIZE", "256"))
+
+_request_id = contextvars.ContextVar("debug_request_id", default=None)
+
+
+def new_request_id():
+    """Sortable unique id: timestamp plus a random suffix"""
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def set_request_id(request_id):
+    """Attribute subsequent captures in this context to request_id; returns a token for reset_request_id"""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token):
+    _request_id.reset(token)
+
+
+def encode_artifact(name, data):
+    """Bytes to write for a str, bytes or image array artifact"""
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    # Image arrays are encoded here, on the writer thread
+    import cv2
+    ok, encoded = cv2.imencode(os.path.splitext(name)[1] or ".png", data)
+    if not ok:
+        raise ValueError(f"Could not encode image artifact {name}")
+    return encoded.tobytes()
+
+
+class DebugCapture:
+    """
+    Background writer for debug artifacts with size-based rotation
+
+    Args:
+        directory: Root directory; each request gets a subdirectory
+        max_bytes: Total size above which the oldest request directories are removed
+        enabled: When False, capture() is a no-op
+        queue_size: Maximum number of artifacts waiting to be written
+    """
+
+    def __init__(self, directory=DEBUG_CAPTURE_DIR, max_bytes=DEBUG_CAPTURE_MAX_BYTES,
+                 enabled=DEBUG_CAPTURE, queue_size=DEBUG_CAPTURE_QUEUE_SIZE):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._total_bytes = None
+
+    def capture(self, name, data, request_id=None):
+        """
+        Queue an artifact for writing
+
+        Args:
+            name: File name inside the request directory, e.g. 'extracted_text.txt'
+            data: str, bytes, or an image array (encoded according to the name's extension)
+            request_id: Defaults to the id set with set_request_id, or a new one
+        """
+        if not self.enabled or data is None:
+            return
+        request_id = request_id or _request_id.get() or new_request_id()
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((request_id, name, data))
+        except queue.Full:
+            logger.warning("Debug capture queue is full, dropping %s/%s", request_id, name)
+
+    def flush(self, timeout=None):
+        """Wait until every queued artifact has been written"""
+        if self._thread is None:
+            return
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return
+            time.sleep(0.01)
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="debug-capture", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            request_id, name, data = self._queue.get()
+            try:
+                self._write(request_id, name, data)
+            except Exception as e:
+                logger.warning("Debug capture failed for %s/%s: %s", request_id, name, e)
+            finally:
+                self._queue.task_done()
+
+    def _write(self, request_id, name, data):
+        payload = encode_artifact(name, data)
+        request_dir = os.path.join(self.directory, request_id)
+        os.makedirs(request_dir, exist_ok=True)
+        path = os.path.join(request_dir, os.path.basename(name))
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        with open(path, "wb") as f:
+            f.write(payload)
+
+        if self._total_bytes is None:
+            self._total_bytes = self._directory_size()
+        else:
+            self._total_bytes += len(payload) - previous
+        if self._total_bytes > self.max_bytes:
+            self._rotate(keep=request_id)
+
+    def _directory_size(self):
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+        return total
+
+    def _rotate(self, keep):
+        """Delete the oldest request directories until the total is under max_bytes"""
+        request_dirs = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.is_dir() and entry.name != keep),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in request_dirs:
+            if self._total_bytes <= self.max_bytes:
+                break
+            size = sum(os.path.getsize(os.path.join(root, f))
+                       for root, _, files in os.walk(entry.path) for f in files)
+            shutil.rmtree(entry.path, ignore_errors=True)
+            self._total_bytes -= size
+
+
+# Process-wide instance used by the pipeline modules
+debug_capture = DebugCapture()
+
+
+def capture(name, data):
+    """Queue an artifact for the current request on the shared DebugCapture"""
+    debug_capture.capture(name, data)
@@ -1,32 +1,43 @@
 import re
-import spacy
-from utils.spacy_model import load_spacy_model
-import pandas as pd
-import nltk
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from utils.spacy_model import load_spacy_model, NER_PIPELINE
+from utils.skill_matcher import has_word_boundaries
+from utils.skill_vocabulary import SkillVocabulary, ReloadingVocabulary
+from utils.model_registry import registry, ensure_nltk_resource, ALLOW_MODEL_DOWNLOADS
+from utils.resume_document import ResumeDocument, normalize_text
+from utils.sections import SECTION_ALTERNATIVES, DEFAULT_HEADINGS, segment_sections
+from utils.patterns import PatternSet, fold_case
+from utils.debug_capture import capture
+from utils.tracing import span
 import string
+import hashlib
 import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _load_stop_words():
+    """English stop words from the NLTK corpus"""
+    ensure_nltk_resource('corpora/stopwords', 'stopwords')
+    from nltk.corpus import stopwords
+    return set(stopwords.words('english'))
+
+
+# Models are registered here but only loaded on first use or by registry.warmup()
+# Only entities are used, so the spaCy pipeline is trimmed to NER
+registry.register('spacy_ner', lambda: load_spacy_model(enable=NER_PIPELINE, allow_download=ALLOW_MODEL_DOWNLOADS))
+registry.register('stop_words', _load_stop_words)
+
+
+def get_nlp():
+    """The spaCy NER pipeline, loaded on first use"""
+    return registry.get('spacy_ner')
+
+
+def get_stop_words():
+    """English stop words, loaded on first use"""
+    return registry.get('stop_words')
 
-# Download NLTK resources if not present
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-try:
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('stopwords', quiet=True)
-try:
-    # Also download punkt_tab resource to fix the error
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt', quiet=True)
-
-# Load the spaCy NLP model for text processing
-print("Loading NLP models...")
-nlp = load_spacy_model()
-stop_words = set(stopwords.words('english'))
 
 TECH_KEYWORDS = [
     'Python', 'Java', 'JavaScript', 'C++', 'C#', 'Ruby', 'PHP', 'Swift', 'Kotlin', 'TypeScript',
@@ -52,86 +63,8 @@ EDUCATION_KEYWORDS = [
     ]
 
 
-def preprocess_text(text):
-    """
-    Clean and preprocess text for better extraction
-    
-    Args:
-        text: Raw text to process
-        
-    Returns:
-        Cleaned and normalized text
-    """
-    # Remove punctuation
-    text = re.sub(r'[^\w\s]', ' ', text)
-    
-    # Convert to lowercase
-    text = text.lower()
-    
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
-
-def extract_batch_year(text):
-    """
-    Extract the graduation/batch year from resume text using regex patterns
-    
-    Args:
-        text: The resume text to extract from
-        
-    Returns:
-        Extracted batch year or None if not found
-    """
-    # Common education year patterns
-    patterns = [
-        r'batch of (20\d{2})',  # "batch of 2023"
-        r'class of (20\d{2})',  # "class of 2023"
-        r'(20\d{2})\s*graduate',  # "2023 graduate"
-        r'graduating\s*in\s*(20\d{2})',  # "graduating in 2023"
-        r'expected graduation:?\s*(20\d{2})',  # "expected graduation: 2023"
-        r'graduation year:?\s*(20\d{2})',  # "graduation year: 2023"
-        r'b\.?tech\.?\s*\(?\s*(20\d{2})',  # "B.Tech (2023"
-        r'b\.?e\.?\s*\(?\s*(20\d{2})',  # "B.E (2023"
-        r'completed in (20\d{2})',  # "completed in 2023"
-        r'passed.{1,20}?(20\d{2})',  # "passed out in 2023"
-        r'degree.{1,30}?(20\d{2})',  # "degree in 2023"
-        r'education.{1,50}?(20\d{2})',  # education section with year
-        # Additional patterns for OCR text which might have errors
-        r'graduated.{1,20}(20\d{2})',  # "graduated in 2023"
-        r'passing.{1,20}(20\d{2})',   # "passing year 2023"
-        r'\b(20\d{2})\b'  # fallback: any 4 digit year starting with 20
-    ]
-    
-    # Try each pattern in sequence until a match is found
-    for pattern in patterns:
-        match = re.search(pattern, text.lower(), re.IGNORECASE)
-        if match:
-            return match.group(1)
-    
-    # Look for education section with years
-    education_section = get_section_text(text, "EDUCATION")
-    if education_section:
-        # Find all years in the education section
-        years = re.findall(r'\b(20\d{2})\b', education_section)
-        if years:
-            # Return the most recent year (assuming it's the graduation year)
-            return max(years)
-    
-    return None
-
-def extract_skills(text):
-    """
-    Extract skills from resume text using pattern matching and NLP techniques
-    
-    Args:
-        text: The resume text to extract skills from
-        
-    Returns:
-        List of identified skills
-    """
-    # Additional technical skills to supplement the main skills database
-    ADDITIONAL_SKILLS = [
+# Additional technical skills to supplement the main skills database
+ADDITIONAL_SKILLS = [
     'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Jenkins', 'Terraform',
     'Flask', 'Django', 'FastAPI', 'Spring Boot', 'Express.js', 'Vue.js',
     'Angular', 'TensorFlow', 'PyTorch', 'scikit-learn', 'Pandas', 'NumPy',
@@ -144,9 +77,8 @@ def extract_skills(text):
     'Grafana', 'ELK Stack', 'Tableau', 'Power BI', 'Looker'
     ]
 
-
-    # Base skills database
-    SKILLS_DB = [
+# Base skills database
+SKILLS_DB = [
     '3D Design', '3D Graphics', '3D Mathematics', '3D Modeling',
     '3D Modeling Tools', '3D Programming', 'Adobe Creative Suite',
     'Agile Methodology', 'AI', 'AJAX', 'Algorithms', 'Animation',
@@ -221,100 +153,198 @@ def extract_skills(text):
     'UX Design Principles', 'UX Research',
     'Version Control', 'Video Editing',
     'VR and AR SDKs', 'VR Platform Knowledge',
-    'Web Accessibility', 'Web Security', 'Wireframing' ]
+    'Web Accessibility', 'Web Security', 'Wireframing'
+    ]
+
+# Bump when a change to text or skill extraction should invalidate cached parse results
+EXTRACTOR_VERSION = "2"
+
+# Extra skills file that ops can edit; picked up without a restart
+SKILLS_FILE = os.getenv("SKILLS_FILE")
+
+# Hash of the built-in skill lists, which together with the skills file determine the vocabulary
+_BUILTIN_SKILLS_DIGEST = hashlib.sha256(
+    '\n'.join(['\0'.join(SKILLS_DB), '\0'.join(ADDITIONAL_SKILLS), '\0'.join(TECH_KEYWORDS)]).encode('utf-8')
+).hexdigest()
+
+# Skill vocabulary, built on first use and shared by every extract_skills call
+_skill_vocabulary = ReloadingVocabulary(
+    lambda extra_skills: SkillVocabulary(SKILLS_DB + ADDITIONAL_SKILLS + extra_skills, TECH_KEYWORDS, get_stop_words()),
+    path=SKILLS_FILE
+)
+
 
-    # Combine all skills into one comprehensive database
-    SKILLS_DB = SKILLS_DB + ADDITIONAL_SKILLS  
+# Graduation/batch year patterns, highest priority first
+BATCH_YEAR_PATTERNS = PatternSet([
+    ('batch_of', r'batch of (20\d{2})'),  # "batch of 2023"
+    ('class_of', r'class of (20\d{2})'),  # "class of 2023"
+    ('year_graduate', r'(20\d{2})\s*graduate'),  # "2023 graduate"
+    ('graduating_in', r'graduating\s*in\s*(20\d{2})'),  # "graduating in 2023"
+    ('expected_graduation', r'expected graduation:?\s*(20\d{2})'),  # "expected graduation: 2023"
+    ('graduation_year', r'graduation year:?\s*(20\d{2})'),  # "graduation year: 2023"
+    ('btech', r'b\.?tech\.?\s*\(?\s*(20\d{2})'),  # "B.Tech (2023"
+    ('be', r'b\.?e\.?\s*\(?\s*(20\d{2})'),  # "B.E (2023"
+    ('completed_in', r'completed in (20\d{2})'),  # "completed in 2023"
+    ('passed', r'passed.{1,20}?(20\d{2})'),  # "passed out in 2023"
+    ('degree', r'degree.{1,30}?(20\d{2})'),  # "degree in 2023"
+    ('education', r'education.{1,50}?(20\d{2})'),  # education section with year
+    # Additional patterns for OCR text which might have errors
+    ('graduated', r'graduated.{1,20}(20\d{2})'),  # "graduated in 2023"
+    ('passing', r'passing.{1,20}(20\d{2})'),  # "passing year 2023"
+    ('any_year', r'\b(20\d{2})\b'),  # fallback: any 4 digit year starting with 20
+])
+
+YEAR = re.compile(r'\b(20\d{2})\b')
+
+# These start with a digit, so re.IGNORECASE costs nothing and the text needs no folding
+EXPERIENCE_PATTERNS = PatternSet([
+    ('years', r'(\d+)\+?\s*(?:years|yrs)'),  # "5 years" or "5+ years"
+    ('fresher', r'fresher'),
+], re.IGNORECASE)
+
+
+def get_skill_vocabulary():
+    """Return the current SkillVocabulary, rebuilding it if the skills file changed"""
+    return _skill_vocabulary.get()
+
+
+def extractor_version(vocabulary=None):
+    """
+    Identifies the extraction code and skill sources that produce a parse result
+
+    Hashes the built-in skill lists and the skills file contents instead of
+    building the vocabulary, so it is cheap enough to call per request.
+
+    Args:
+        vocabulary: SkillVocabulary a parse actually used; defaults to the
+            skills file as it is now
+
+    Returns:
+        Version string such as '2-1a2b3c4d5e6f'
+    """
+    skills_file = vocabulary.source_digest if vocabulary is not None else _skill_vocabulary.source_digest()
+    digest = hashlib.sha256(_BUILTIN_SKILLS_DIGEST.encode('ascii'))
+    digest.update(skills_file.encode('ascii'))
+    return f"{EXTRACTOR_VERSION}-{digest.hexdigest()[:12]}"
+
+
+def preprocess_text(text):
+    """
+    Clean and preprocess text for better extraction
     
+    Args:
+        text: Raw text to process
+        
+    Returns:
+        Cleaned and normalized text
+    """
+    # Remove punctuation, convert to lowercase and remove extra whitespace
+    return normalize_text(text)
+
+def extract_batch_year(text):
+    """
+    Extract the graduation/batch year from resume text using regex patterns
+    
+    Args:
+        text: The resume text to extract from
+        
+    Returns:
+        Extracted batch year or None if not found
+    """
+    return match_batch_year(text)[0]
+
+def match_batch_year(text):
+    """
+    Extract the batch year along with the pattern that found it
+    
+    Args:
+        text: The resume text to extract from
+        
+    Returns:
+        (batch year, pattern ID) or (None, None) if not found
+    """
+    # The first pattern (in priority order) that matches anywhere wins
+    pattern_id, year = BATCH_YEAR_PATTERNS.search(fold_case(text))
+    if pattern_id:
+        return year, pattern_id
+    
+    # Look for education section with years
+    education_section = get_section_text(text, "EDUCATION")
+    if education_section:
+        # Find all years in the education section
+        years = YEAR.findall(education_section)
+        if years:
+            # Return the most recent year (assuming it's the graduation year)
+            return max(years), 'education_section'
+    
+    return None, None
+
+def extract_skills(text, doc=None):
+    """
+    Extract skills from resume text using pattern matching and NLP techniques
+    
+    Args:
+        text: The resume text to extract skills from, or a ResumeDocument of it
+        doc: spaCy Doc for text if it was already parsed (e.g. by nlp.pipe)
+        
+    Returns:
+        List of identified skills
+    """
     # Set to store found skills (prevents duplicates)
     found_skills = set()
     
-    # Prepare a list of skills in lower case for matching
-    skills_lower = [skill.lower() for skill in SKILLS_DB]
-    skills_dict = {skill.lower(): skill for skill in SKILLS_DB}
+    # Precomputed lookups over the combined skills database
+    vocabulary = get_skill_vocabulary()
+    stop_words = get_stop_words()
     
-    # Preprocess text for better matching
-    text_normalized = preprocess_text(text)
+    # Normalized text, tokens and entities are computed once per document
+    document = text if isinstance(text, ResumeDocument) else ResumeDocument(text, nlp_doc=doc)
     
     # APPROACH 1: Extract skills using word tokenization
     # This helps with OCR text which might have spacing issues
-    tokens = word_tokenize(text_normalized)
-    
-    # Check for single-word skills
-    for token in tokens:
-        if token.lower() in skills_dict and token.lower() not in stop_words:
-            found_skills.add(skills_dict[token.lower()])
-    
-    # Check for multi-word skills (bigrams, trigrams)
-    for i in range(len(tokens)):
-        # Check bigrams (2-word phrases)
-        if i < len(tokens) - 1:
-            bigram = tokens[i] + ' ' + tokens[i+1]
-            if bigram.lower() in skills_dict:
-                found_skills.add(skills_dict[bigram.lower()])
-                
-        # Check trigrams (3-word phrases)
-        if i < len(tokens) - 2:
-            trigram = tokens[i] + ' ' + tokens[i+1] + ' ' + tokens[i+2]
-            if trigram.lower() in skills_dict:
-                found_skills.add(skills_dict[trigram.lower()])
-    
-    # APPROACH 2: Use regular expressions with word boundaries
-    # This helps find skills that are distinct words
-    text_lower = text.lower()
-    for skill, original in skills_dict.items():
-        # Skip single-character skills (too many false positives)
-        if len(skill) <= 1:
-            continue
-            
-        # For skills that are common words, only match if they are distinct
-        if len(skill) <= 3 or skill in stop_words:
-            try:
-                # Use word boundary to ensure it's a complete word
-                pattern = r'\b' + re.escape(skill) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.add(original)
-            except:
-                # Skip if regex fails
+    with span('skills.approach_1_tokens'):
+        # Check for single-word skills
+        unigrams = vocabulary.ngram_buckets.get(1, {})
+        for token in document.tokens:
+            if token in unigrams and token not in stop_words:
+                found_skills.add(unigrams[token])
+        
+        # Check for multi-word skills (bigrams, trigrams)
+        for n in (2, 3):
+            bucket = vocabulary.ngram_buckets.get(n)
+            if not bucket:
                 continue
-        else:
-            # For technical terms, direct matching is usually fine
-            if skill in text_lower:
-                found_skills.add(original)
-                
+            for ngram in document.ngrams(n):
+                if ngram in bucket:
+                    found_skills.add(bucket[ngram])
+    
+    # APPROACH 2: Match every skill with word boundaries where needed
     # APPROACH 3: Look for technical keywords specific to OCR text
-    # OCR might introduce errors in exact matches, so use fuzzy matching for key technologies
-    for keyword in TECH_KEYWORDS:
-        # Simplified matching for OCR errors
-        variations = [
-            keyword,
-            keyword.replace(' ', ''),  # remove spaces
-            keyword.replace('-', ''),  # remove hyphens
-            keyword.replace('.', '')   # remove periods
-        ]
-        
-        for var in variations:
-            if var in text_lower:
-                # Map back to a skill in our database if possible
-                for skill, original in skills_dict.items():
-                    if var in skill.lower() or skill.lower() in var:
-                        found_skills.add(original)
-                        break
+    # OCR might introduce errors in exact matches, so keyword variations are mapped to skills
+    # Both run as a single pass of the precompiled skill automaton over the text
+    with span('skills.approach_2_3_automaton'):
+        text_lower = document.lower
+        for end, (pattern, candidates) in vocabulary.automaton.iter(text_lower):
+            for original, needs_boundary in candidates:
+                if original in found_skills:
+                    continue
+                # For skills that are common words, only match if they are distinct
+                if needs_boundary and not has_word_boundaries(text_lower, end - len(pattern) + 1, end + 1):
+                    continue
+                found_skills.add(original)
     
     # APPROACH 4: Use NLP for entity recognition
     # This can help identify technology mentions that might be missed
     try:
-        doc = nlp(text)
+        with span('skills.approach_4_ner'):
+            entities = document.entities
         
         # Extract entities that might be technologies
-        for ent in doc.ents:
-            if ent.label_ in ['PRODUCT', 'ORG', 'GPE']:
-                ent_text = ent.text.lower()
-                
-                # Check if this entity matches any known skill
-                for skill, original in skills_dict.items():
-                    if skill == ent_text or skill in ent_text or ent_text in skill:
-                        found_skills.add(original)
+        with span('skills.approach_4_entities'):
+            for ent_text, label, _, _ in entities:
+                if label in ['PRODUCT', 'ORG', 'GPE']:
+                    # Check if this entity matches, contains or is part of any known skill
+                    found_skills.update(vocabulary.related_skills(ent_text))
     except:
         # Continue if NLP processing fails
         pass
@@ -332,16 +362,23 @@ def extract_experience(text):
     Returns:
         Number of years of experience, or 0 if not found
     """
-    # Look for patterns like "5 years" or "5+ years"
-    exp_match = re.search(r'(\d+)\+?\s*(years|yrs)', text, re.IGNORECASE)
-    if exp_match:
-        return int(exp_match.group(1))
-        
-    # Check for "fresher" indication
-    if "fresher" in text.lower():
-        return 0
+    return match_experience(text)[0]
+
+def match_experience(text):
+    """
+    Extract years of experience along with the pattern that found them
+    
+    Args:
+        text: The resume text to extract from
         
-    return 0
+    Returns:
+        (years of experience, pattern ID); the ID is 'fresher' for an explicit
+        fresher, None if nothing matched
+    """
+    pattern_id, value = EXPERIENCE_PATTERNS.search(text)
+    if pattern_id == 'years':
+        return int(value), pattern_id
+    return 0, pattern_id
 
 def get_section_text(text, section_name):
     """
@@ -354,71 +391,51 @@ def get_section_text(text, section_name):
     Returns:
         The text content of the specified section, or empty string if not found
     """
-    # Pattern to match from section heading to the next heading or end of text
-    pattern = rf"{section_name}(.*?)(?=\n[A-Z][A-Z ]+\n|$)"
-    match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-    if match:
-        return match.group(1)
-    
-    # Try alternative section headings for common sections
-    alternatives = {
-        'EDUCATION': ['ACADEMIC BACKGROUND', 'EDUCATIONAL QUALIFICATIONS', 'EDUCATION DETAILS', 'QUALIFICATION'],
-        'SKILLS': ['TECHNICAL SKILLS', 'CORE COMPETENCIES', 'TECHNOLOGIES', 'SKILL SET', 'PROGRAMMING'],
-        'EXPERIENCE': ['WORK EXPERIENCE', 'PROFESSIONAL EXPERIENCE', 'WORK HISTORY', 'EMPLOYMENT']
-    }
-    
-    if section_name in alternatives:
-        for alt in alternatives[section_name]:
-            pattern = rf"{alt}(.*?)(?=\n[A-Z][A-Z ]+\n|$)"
-            match = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
-            if match:
-                return match.group(1)
-    
-    return ""
+    # Known sections share one compiled segmenter; other names get their own
+    headings = DEFAULT_HEADINGS
+    if section_name.upper() not in headings:
+        headings = [section_name] + SECTION_ALTERNATIVES.get(section_name, [])
+    return segment_sections(text, headings).get(section_name)
 
-def process_resume(text):
+def process_resume(text, skills_doc=None):
     """
     Main function to process a resume and extract key information
     
     Args:
         text: The full resume text
+        skills_doc: Precomputed spaCy Doc of the skills text (see process_resumes)
         
     Returns:
         Dictionary with extracted information
     """
-    print("\n--- Starting resume analysis ---")
-    
     # Handle potential empty or invalid text
     if not text or len(text.strip()) < 10:
-        print("Error: Text is too short or empty")
+        logger.warning("Resume text is too short or empty")
         return {'Skills': [], 'Batch Year': None}
         
-    # Save the extracted text for debugging
-    try:
-        os.makedirs('output/debug', exist_ok=True)
-        with open('output/debug/extracted_text.txt', 'w', encoding='utf-8') as f:
-            f.write(text)
-        print(f"Saved extracted text to output/debug/extracted_text.txt")
-    except:
-        pass
+    # Keep the extracted text for debugging (only with DEBUG_CAPTURE=1)
+    capture('extracted_text.txt', text)
     
-    # Extract text from specific sections if they exist
-    skills_section = get_section_text(text, "SKILLS")
-    education_section = get_section_text(text, "EDUCATION")
+    document = ResumeDocument(text)
     
-    print(f"Found skills section: {'Yes' if skills_section else 'No'}")
-    print(f"Found education section: {'Yes' if education_section else 'No'}")
+    # Extract text from specific sections if they exist
+    with span('sections'):
+        sections = document.sections
+        skills_section = sections.get("SKILLS")
+        education_section = sections.get("EDUCATION")
 
     # Extract skills from the skills section or the entire text if section not found
-    skills = extract_skills(skills_section if skills_section else text)
-    print(f"Extracted {len(skills)} skills")
+    with span('skills'):
+        skills_document = ResumeDocument(skills_section if skills_section else text, nlp_doc=skills_doc)
+        skills = extract_skills(skills_document)
     
     # Extract batch year
-    batch_year = extract_batch_year(education_section if education_section else text)
-    print(f"Extracted batch year: {batch_year}")
+    with span('batch_year'):
+        batch_year, batch_year_pattern = match_batch_year(education_section if education_section else text)
     
     # Extract experience
-    experience = extract_experience(text)
+    with span('experience'):
+        experience, experience_pattern = match_experience(text)
     
     # Build and return the extracted information
     result = {
@@ -427,5 +444,37 @@ def process_resume(text):
         'Experience': experience
     }
     
-    print("--- Resume analysis completed ---")
+    logger.info("Resume analysis completed", extra={
+        'skills_section': bool(skills_section),
+        'education_section': bool(education_section),
+        'skill_count': len(skills),
+        'batch_year': batch_year,
+        'batch_year_pattern': batch_year_pattern,
+        'experience_pattern': experience_pattern,
+    })
     return result
+
+def process_resumes(texts, n_process=1, batch_size=32):
+    """
+    Process many resumes at once for bulk ingestion
+    
+    The NER pass runs over all resumes with nlp.pipe, which batches documents
+    and can fan out to several processes, instead of one nlp() call per resume.
+    
+    Args:
+        texts: List of full resume texts
+        n_process: Number of processes for nlp.pipe
+        batch_size: Number of texts per nlp.pipe batch
+        
+    Returns:
+        List of process_resume results, in the same order as texts
+    """
+    # Same text extract_skills would see: the skills section, or the whole resume
+    skills_texts = []
+    for text in texts:
+        text = text or ""
+        skills_section = segment_sections(text).get("SKILLS")
+        skills_texts.append(skills_section if skills_section else text)
+    
+    docs = get_nlp().pipe(skills_texts, n_process=n_process, batch_size=batch_size)
+    return [process_resume(text, skills_doc=doc) for text, doc in zip(texts, docs)]
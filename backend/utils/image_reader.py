@@ -3,19 +3,52 @@ import pytesseract
 import cv2
 import numpy as np
 import os
+import io
 import re
+import time
 import logging
-from datetime import datetime
-
-# Set up logging
-log_dir = os.path.join('output', 'logs')
-os.makedirs(log_dir, exist_ok=True)
-log_file = os.path.join(log_dir, f'ocr_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log')
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.debug_capture import capture
+from utils.tracing import record_span, bind_context
+
+# Handlers and format are set up once by utils.tracing.configure_logging
+logger = logging.getLogger(__name__)
+
+# OCR configurations in order of effectiveness
+OCR_CONFIGS = [
+    '--oem 3 --psm 6',  # Block of text
+    '--oem 3 --psm 3',  # Auto-detect layout
+]
+
+# How extract_text_from_image uses OCR_CONFIGS:
+#   'confidence' - run the first config, fall back to the next only when the
+#                  mean word confidence is below OCR_CONFIDENCE_THRESHOLD
+#   'concurrent' - run all configs at the same time and keep the longest text
+#   'longest'    - run all configs one after another and keep the longest text
+OCR_STRATEGY = os.getenv("OCR_STRATEGY", "confidence")
+OCR_CONFIDENCE_THRESHOLD = float(os.getenv("OCR_CONFIDENCE_THRESHOLD", "60"))
+
+# Images are resized so both sides are at least OCR_MIN_SIDE pixels, or at most
+# OCR_MAX_SIDE for large photos, roughly 100-300 DPI for a letter-size page
+OCR_MIN_SIDE = int(os.getenv("OCR_MIN_SIDE", "1000"))
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "3000"))
+
+# Grayscale decode flags by downscale factor; JPEGs are scaled while decoding
+REDUCED_GRAYSCALE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+
+# Common OCR errors, fixed with a single str.translate pass
+OCR_REPLACEMENTS = str.maketrans({
+    '|': 'I', '{': '(', '}': ')', '@': 'a', '$': 'S',
+    '0': 'O', '[': '(', ']': ')', '<': '(', '>': ')',
+})
+
+WHITESPACE = re.compile(r'\s+')
 
 def setup_tesseract():
     """Find and set up Tesseract OCR"""
@@ -30,7 +63,7 @@ def setup_tesseract():
     for path in tesseract_paths:
         if os.path.exists(path):
             pytesseract.pytesseract.tesseract_cmd = path
-            logging.info(f"Using Tesseract at: {path}")
+            logger.debug("Using Tesseract at: %s", path)
             return True
     
     # Try using tesseract from PATH
@@ -41,44 +74,80 @@ def setup_tesseract():
                              stderr=subprocess.PIPE,
                              text=True)
         if 'tesseract' in result.stdout.lower():
-            logging.info("Using Tesseract from system PATH")
+            logger.debug("Using Tesseract from system PATH")
             return True
     except:
         pass
     
-    print("Tesseract OCR not found. Please install it from: https://github.com/UB-Mannheim/tesseract/wiki")
-    logging.error("Tesseract OCR not found")
+    logger.error("Tesseract OCR not found. Please install it from: https://github.com/UB-Mannheim/tesseract/wiki")
     return False
 
-def preprocess_image(image):
-    """Apply optimal preprocessing for resume images"""
-    # Convert to numpy array if PIL Image
-    if isinstance(image, Image.Image):
-        image_np = np.array(image)
-        image_cv = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
+def target_size(width, height):
+    """Size an image is resized to for OCR, decided before any filtering"""
+    if width < OCR_MIN_SIDE or height < OCR_MIN_SIDE:
+        scale = max(OCR_MIN_SIDE / width, OCR_MIN_SIDE / height)
+    elif width > OCR_MAX_SIDE or height > OCR_MAX_SIDE:
+        scale = min(OCR_MAX_SIDE / width, OCR_MAX_SIDE / height)
     else:
-        image_cv = image
+        return width, height
+    return int(width * scale), int(height * scale)
+
+def decode_reduction(width, height):
+    """Largest IMREAD_REDUCED_* factor that keeps the image at least as large as its target size"""
+    target_width, target_height = target_size(width, height)
+    factor = 1
+    while factor < 8 and width // (factor * 2) >= target_width and height // (factor * 2) >= target_height:
+        factor *= 2
+    return factor
+
+def record_stage(timings, stage, start):
+    """
+    Record the seconds since start as an 'image.<stage>' span (and under stage
+    in timings, if it is a dict); returns the current time
+    """
+    now = time.perf_counter()
+    if timings is not None:
+        timings[stage] = now - start
+    record_span(f'image.{stage}', now - start)
+    return now
+
+def preprocess_image(image, timings=None):
+    """
+    Apply optimal preprocessing for resume images
     
-    # Convert to grayscale
-    gray = cv2.cvtColor(image_cv, cv2.COLOR_BGR2GRAY) if len(image_cv.shape) == 3 else image_cv
+    The image is converted to grayscale and brought to its target size
+    first, so the blur and threshold never run on a full-size photo.
+    
+    Args:
+        image: Grayscale or BGR array, or a PIL image
+        timings: Optional dict that receives seconds spent per stage
+    """
+    start = time.perf_counter()
+    # Convert to grayscale; PIL converts directly, without an intermediate BGR copy
+    if isinstance(image, Image.Image):
+        gray = np.asarray(image.convert('L'))
+    elif image.ndim == 3:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    else:
+        gray = image
+    start = record_stage(timings, 'grayscale', start)
     
     # Resize for optimal OCR
     height, width = gray.shape
-    if width < 1000 or height < 1000:
-        scale = max(1000 / width, 1000 / height)
-        new_width, new_height = int(width * scale), int(height * scale)
-        gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
-    elif width > 3000 or height > 3000:
-        scale = min(3000 / width, 3000 / height)
-        new_width, new_height = int(width * scale), int(height * scale)
-        gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_AREA)
+    new_width, new_height = target_size(width, height)
+    if (new_width, new_height) != (width, height):
+        interpolation = cv2.INTER_CUBIC if new_width > width else cv2.INTER_AREA
+        gray = cv2.resize(gray, (new_width, new_height), interpolation=interpolation)
+    start = record_stage(timings, 'resize', start)
     
     # Apply adaptive thresholding
     blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    start = record_stage(timings, 'blur', start)
     thresh = cv2.adaptiveThreshold(
         blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
         cv2.THRESH_BINARY, 11, 2
     )
+    record_stage(timings, 'threshold', start)
     
     return thresh
 
@@ -88,87 +157,163 @@ def clean_ocr_text(text):
         return ""
     
     # Replace common OCR errors
-    replacements = {
-        '|': 'I', '{': '(', '}': ')', '@': 'a', '$': 'S',
-        '0': 'O', '[': '(', ']': ')', '<': '(', '>': ')',
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    text = text.translate(OCR_REPLACEMENTS)
     
     # Normalize whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = WHITESPACE.sub(' ', text)
     
-    # Remove non-printable characters
-    text = ''.join(c for c in text if c.isprintable() or c.isspace())
+    # Remove non-printable characters (the per-character pass only runs if there are any)
+    if not text.isprintable():
+        text = ''.join(c for c in text if c.isprintable() or c.isspace())
     
     return text.strip()
 
-def extract_text_from_image(img_path):
-    """Extract text from resume image"""
-    print(f"\nProcessing image: {img_path}")
-    logging.info(f"Starting OCR on: {img_path}")
+def decode_image(img_source, grayscale=False):
+    """
+    Decode an image from a path, bytes or a binary file-like object
+    
+    In-memory inputs are decoded with cv2.imdecode straight from the buffer,
+    without writing them to disk. With grayscale=True the image is decoded
+    straight to a single channel, and large images are downscaled during
+    decoding (IMREAD_REDUCED_GRAYSCALE_*) as far as their OCR target size
+    allows, so no full-size color copy is ever made.
+    
+    Returns:
+        BGR (or grayscale) image array, or None if it could not be decoded
+    """
+    is_path = isinstance(img_source, (str, os.PathLike))
+    if not is_path and not isinstance(img_source, (bytes, bytearray, memoryview)):
+        if hasattr(img_source, 'seek'):
+            img_source.seek(0)
+        img_source = img_source.read()
+    
+    flag = cv2.IMREAD_COLOR
+    if grayscale:
+        try:
+            # PIL reads only the header here, not the pixels
+            header_source = os.fspath(img_source) if is_path else io.BytesIO(img_source)
+            with Image.open(header_source) as header:
+                width, height = header.size
+            flag = REDUCED_GRAYSCALE_FLAGS[decode_reduction(width, height)]
+        except Exception:
+            flag = cv2.IMREAD_GRAYSCALE
+    
+    if is_path:
+        return cv2.imread(os.fspath(img_source), flag)
+    buffer = np.frombuffer(img_source, dtype=np.uint8)
+    if buffer.size == 0:
+        return None
+    return cv2.imdecode(buffer, flag)
+
+def ocr_with_confidence(image, config):
+    """
+    Run Tesseract once and return the cleaned text with its mean word confidence
+    
+    Uses image_to_data, which yields the recognized words and their
+    confidences in a single OCR pass.
+    
+    Returns:
+        Tuple of (cleaned text, mean confidence 0-100; -1 if no words were found)
+    """
+    data = pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+    
+    lines = {}
+    confidences = []
+    for i, word in enumerate(data['text']):
+        conf = float(data['conf'][i])
+        if conf < 0 or not word.strip():
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines.setdefault(key, []).append(word)
+        confidences.append(conf)
+    
+    text = '\n'.join(' '.join(words) for words in lines.values())
+    mean_confidence = sum(confidences) / len(confidences) if confidences else -1.0
+    return clean_ocr_text(text), mean_confidence
+
+def run_ocr(image, strategy=None, threshold=None):
+    """
+    OCR an image according to an OCR_STRATEGY
+    
+    Args:
+        image: Preprocessed image
+        strategy: 'confidence', 'concurrent' or 'longest' (defaults to OCR_STRATEGY)
+        threshold: Mean confidence below which 'confidence' tries the next config
+        
+    Returns:
+        Tuple of (best cleaned text, its mean confidence)
+    """
+    strategy = strategy or OCR_STRATEGY
+    threshold = OCR_CONFIDENCE_THRESHOLD if threshold is None else threshold
+    
+    if strategy == 'concurrent':
+        # Tesseract runs as a subprocess, so threads do run the configs in parallel
+        with ThreadPoolExecutor(max_workers=len(OCR_CONFIGS)) as executor:
+            results = list(executor.map(bind_context(lambda config: ocr_with_confidence(image, config)), OCR_CONFIGS))
+    elif strategy == 'longest':
+        results = [ocr_with_confidence(image, config) for config in OCR_CONFIGS]
+    else:
+        results = []
+        for config in OCR_CONFIGS:
+            results.append(ocr_with_confidence(image, config))
+            if results[-1][1] >= threshold:
+                break
+            logger.info("OCR confidence %.1f below %s with '%s'", results[-1][1], threshold, config)
+    
+    # Keep the longest text, as before; ties go to the earlier config
+    return max(results, key=lambda result: len(result[0]))
+
+def extract_text_from_image(img_source):
+    """
+    Extract text from resume image
+    
+    Args:
+        img_source: Path, bytes, or a readable binary file-like object
+    """
+    is_path = isinstance(img_source, (str, os.PathLike))
+    img_path = os.fspath(img_source) if is_path else "<in-memory image>"
+    logger.info("Starting OCR on: %s", img_path)
     
     # Check if file exists
-    if not os.path.isfile(img_path):
-        print(f"Error: Image file not found at {img_path}")
-        logging.error(f"File not found: {img_path}")
+    if is_path and not os.path.isfile(img_path):
+        logger.error("Image file not found at %s", img_path)
         return ""
     
     if not setup_tesseract():
         return ""
     
     try:
-        # Load and preprocess image
-        image = cv2.imread(img_path)
+        timings = {}
+        start = time.perf_counter()
+        
+        # Load the image straight to grayscale, reduced while decoding if it is large
+        image = decode_image(img_source, grayscale=True)
         if image is None:
-            logging.error(f"Failed to load image: {img_path}")
+            logger.error("Failed to load image: %s", img_path)
             return ""
+        start = record_stage(timings, 'decode', start)
         
         # Preprocess image
-        processed = preprocess_image(image)
-        
-        # Save debug image
-        debug_dir = "output/debug/images"
-        os.makedirs(debug_dir, exist_ok=True)
-        cv2.imwrite(os.path.join(debug_dir, "processed.jpg"), processed)
-        
-        # OCR configurations in order of effectiveness
-        ocr_configs = [
-            '--oem 3 --psm 6',  # Block of text
-            '--oem 3 --psm 3',  # Auto-detect layout
-        ]
+        processed = preprocess_image(image, timings)
+        start = time.perf_counter()
         
-        # Try OCR with different configs
-        best_text = ""
-        best_length = 0
+        # Keep the debug image (only with DEBUG_CAPTURE=1)
+        capture('processed.jpg', processed)
         
-        for config in ocr_configs:
-            text = pytesseract.image_to_string(processed, config=config)
-            cleaned_text = clean_ocr_text(text)
-            
-            if len(cleaned_text) > best_length:
-                best_text = cleaned_text
-                best_length = len(cleaned_text)
+        best_text, best_confidence = run_ocr(processed)
+        record_stage(timings, 'ocr', start)
+        best_length = len(best_text)
         
         if best_text:
-            print(f"Successfully extracted text ({best_length} characters)")
-            
-            # Preview of extracted text
-            preview = best_text[:200] + "..." if len(best_text) > 200 else best_text
-            print("\nText preview:")
-            print("-" * 50)
-            print(preview)
-            print("-" * 50)
-            
-            # Save text to debug file
-            with open(os.path.join("output/debug", "extracted_text.txt"), "w", encoding="utf-8") as f:
-                f.write(best_text)
+            logger.info("Extracted %d characters from %s (mean confidence %.1f)", best_length, img_path,
+                        best_confidence, extra={'stage_ms': {stage: round(seconds * 1000, 1)
+                                                             for stage, seconds in timings.items()}})
+            capture('ocr_text.txt', best_text)
         else:
-            print("Failed to extract text from image")
+            logger.warning("Failed to extract text from image %s", img_path)
         
         return best_text
         
     except Exception as e:
-        logging.error(f"Error in extract_text_from_image: {str(e)}")
+        logger.exception("Error in extract_text_from_image: %s", e)
         return ""
\ No newline at end of file
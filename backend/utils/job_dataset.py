@@ -0,0 +1,222 @@
+"""
+Compiled, memory-mappable form of the job-skill dataset
+
+The build step parses job_skill_dataset.csv, fits the recommender once and
+writes a directory of .npy arrays next to it:
+
+    titles_blob.npy / titles_offsets.npy           job titles (UTF-8 blob + byte offsets)
+    skills_blob.npy / skills_offsets.npy           interned skill names, by skill ID
+    vocabulary_blob.npy / vocabulary_offsets.npy   vectorizer terms, by column
+    group_indptr.npy / group_indices.npy           CSR rows of skill IDs, one row per
+                                                   distinct skill list (in order)
+    incidence_{data,indices,indptr}.npy            distinct list x skill incidence (CSR)
+    vectors_{data,indices,indptr}.npy              distinct list x term counts (CSR)
+    norms.npy                                      L2 norm of every vectors row
+    job_groups.npy                                 distinct list row of every job
+    meta.json                                      format, shapes, version, source hash
+
+Jobs with identical skill lists (3D Designer, 3D Artist, 3D Modeler, ...)
+share one row. At startup every array is opened with mmap_mode='r' and the
+sparse matrices are built on top of them without copying, so worker
+processes share the data through the page cache instead of each parsing
+the CSV and fitting the vectorizer. Strings are decoded only when read.
+
+Build from the backend directory:
+    python -m utils.job_dataset job_skill_dataset.csv
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+logger = logging.getLogger(__name__)
+
+# Bump when the file layout changes; older artifacts are then ignored
+ARTIFACT_FORMAT = 2
+
+
+class StringTable(Sequence):
+    """Read-only list of strings backed by a UTF-8 blob, decoded one item at a time"""
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._blob[self._offsets[index]:self._offsets[index + 1]].tobytes().decode('utf-8')
+
+
+def default_artifact_path(csv_path):
+    """Artifact directory used for a dataset CSV: job_skill_dataset.csv -> job_skill_dataset.index"""
+    return Path(csv_path).with_suffix('.index')
+
+
+def source_digest(csv_path):
+    """SHA-256 of the dataset CSV, recorded in the artifact to detect a stale build"""
+    return hashlib.sha256(Path(csv_path).read_bytes()).hexdigest()
+
+
+def save_strings(path, name, strings):
+    """Store strings as one UTF-8 blob plus cumulative byte offsets"""
+    encoded = [string.encode('utf-8') for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(item) for item in encoded])
+    np.save(path / f'{name}_blob.npy', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    np.save(path / f'{name}_offsets.npy', offsets)
+
+
+def load_strings(path, name):
+    """Memory-mapped StringTable written by save_strings"""
+    return StringTable(np.load(path / f'{name}_blob.npy', mmap_mode='r'),
+                       np.load(path / f'{name}_offsets.npy', mmap_mode='r'))
+
+
+def save_csr(path, name, matrix):
+    """Store a CSR matrix as three arrays, with one index dtype so loading needs no conversion"""
+    matrix = sparse.csr_matrix(matrix)
+    matrix.sort_indices()
+    np.save(path / f'{name}_data.npy', matrix.data)
+    np.save(path / f'{name}_indices.npy', matrix.indices.astype(np.int32))
+    np.save(path / f'{name}_indptr.npy', matrix.indptr.astype(np.int32))
+    return list(matrix.shape)
+
+
+def load_csr(path, name, shape):
+    """CSR matrix written by save_csr, built directly on the memory-mapped arrays"""
+    arrays = [np.load(path / f'{name}_{part}.npy', mmap_mode='r') for part in ('data', 'indices', 'indptr')]
+    return sparse.csr_matrix(tuple(arrays), shape=tuple(shape), copy=False)
+
+
+def write_artifact(path, strings, arrays, matrices, meta):
+    """
+    Write a compiled dataset directory
+
+    The artifact is built in a sibling temporary directory and renamed into
+    place, never written over in place: running workers keep the previous
+    files memory-mapped, and rewriting a mapped file would change their data
+    under them or crash them with SIGBUS when it is truncated. Their old
+    files stay readable after the swap, until the last mapping is closed.
+
+    Args:
+        path: Artifact directory, replaced if it exists
+        strings: Name -> list of strings
+        arrays: Name -> numpy array
+        matrices: Name -> sparse matrix, stored as CSR
+        meta: Extra metadata (dataset version, source hash, ...)
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    build = Path(tempfile.mkdtemp(prefix=f'{path.name}.build-', dir=path.parent))
+    try:
+        for name, values in strings.items():
+            save_strings(build, name, values)
+        for name, values in arrays.items():
+            np.save(build / f'{name}.npy', values)
+        shapes = {name: save_csr(build, name, matrix) for name, matrix in matrices.items()}
+        meta = dict(meta, format=ARTIFACT_FORMAT, strings=list(strings), arrays=list(arrays), matrices=shapes)
+        (build / 'meta.json').write_text(json.dumps(meta, indent=2))
+        # mkdtemp creates the directory private to this user; readers may run as another
+        os.chmod(build, 0o755)
+    except BaseException:
+        shutil.rmtree(build, ignore_errors=True)
+        raise
+
+    # A directory cannot be renamed over a non-empty one: move the old build aside first
+    previous = None
+    if path.exists():
+        previous = Path(tempfile.mkdtemp(prefix=f'{path.name}.old-', dir=path.parent))
+        os.replace(path, previous / path.name)
+    try:
+        os.replace(build, path)
+    except BaseException:
+        if previous is not None:
+            os.replace(previous / path.name, path)
+            shutil.rmtree(previous, ignore_errors=True)
+        shutil.rmtree(build, ignore_errors=True)
+        raise
+    if previous is not None:
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def read_artifact(path):
+    """
+    Open a compiled dataset directory without copying its contents
+
+    Args:
+        path: Artifact directory
+
+    Returns:
+        Dict of StringTables, read-only memory-mapped arrays and CSR
+        matrices by name, plus 'meta'
+    """
+    path = Path(path)
+    meta = json.loads((path / 'meta.json').read_text())
+    if meta.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"{path} has artifact format {meta.get('format')}, expected {ARTIFACT_FORMAT}")
+    artifact = {'meta': meta}
+    for name in meta['strings']:
+        artifact[name] = load_strings(path, name)
+    for name in meta['arrays']:
+        artifact[name] = np.load(path / f'{name}.npy', mmap_mode='r')
+    for name, shape in meta['matrices'].items():
+        artifact[name] = load_csr(path, name, shape)
+    return artifact
+
+
+def artifact_status(csv_path, artifact_path):
+    """
+    Check whether an artifact can stand in for the CSV
+
+    Returns:
+        None if the artifact is usable, otherwise the reason it is not
+    """
+    meta_path = Path(artifact_path) / 'meta.json'
+    if not meta_path.exists():
+        return "not built"
+    try:
+        meta = json.loads(meta_path.read_text())
+    except (OSError, ValueError) as e:
+        return f"unreadable ({e})"
+    if meta.get('format') != ARTIFACT_FORMAT:
+        return f"format {meta.get('format')}, expected {ARTIFACT_FORMAT}"
+    # Deployments may ship only the artifact; otherwise it must match the CSV
+    if Path(csv_path).exists() and meta.get('source_sha256') != source_digest(csv_path):
+        return "older than the CSV"
+    return None
+
+
+def main():
+    from utils.recommender import JobIndex
+
+    parser = argparse.ArgumentParser(description="Compile the job-skill dataset CSV into a memory-mappable artifact")
+    parser.add_argument("csv", help="Path to job_skill_dataset.csv")
+    parser.add_argument("--output", help="Artifact directory (default: next to the CSV, with an .index suffix)")
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else default_artifact_path(args.csv)
+    index = JobIndex.from_csv(args.csv)
+    index.save(output, source_sha256=source_digest(args.csv))
+    print(f"Wrote {output}: {len(index)} jobs, {index.group_count} distinct skill lists, "
+          f"{len(index.skill_names)} skills (version {index.version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Prometheus metrics for the API process
+
+Stage latencies come from tracing spans: spans finished in the API process
+reach observe_span() through the tracing sink, and the span lists returned
+by the parser workers are passed to observe_spans(). The /metrics endpoint
+serves the default registry.
+"""
+
+from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+STAGE_LATENCY = Histogram(
+    "resume_stage_duration_seconds",
+    "Latency of resume pipeline stages, from tracing spans",
+    ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+
+PDF_PAGES = Counter(
+    "pdf_pages_total",
+    "PDF pages extracted, by the backend that produced their text",
+    ["backend"],
+)
+
+
+def observe_span(name, seconds):
+    STAGE_LATENCY.labels(stage=name).observe(seconds)
+
+
+def observe_spans(spans):
+    """Add (name, seconds) spans, e.g. those returned by a worker, to the stage latency histogram"""
+    for name, seconds in spans:
+        observe_span(name, seconds)
+
+
+def count_pdf_pages(text_backends):
+    """Add a {backend: page count} mapping to the PDF page counter"""
+    for backend, pages in text_backends.items():
+        PDF_PAGES.labels(backend=backend).inc(pages)
+
+
+def render_metrics():
+    """Body and content type for the /metrics response"""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,98 @@
+"""
+Lazy registry for NLP models and corpora
+
+Nothing is loaded or downloaded at import time. Each model is loaded the
+first time it is requested, or up front by an explicit warmup() call, and
+its load time is recorded so slow starts are visible.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Set ALLOW_MODEL_DOWNLOADS=0 in offline containers so missing models fail fast
+ALLOW_MODEL_DOWNLOADS = os.getenv("ALLOW_MODEL_DOWNLOADS", "1") != "0"
+
+
+class ModelRegistry:
+    """Named model loaders, each run at most once per process"""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._lock = threading.RLock()
+        self.load_times = {}
+
+    def register(self, name, loader):
+        """
+        Register a zero-argument loader under a name
+
+        Args:
+            name: Key used with get() and warmup()
+            loader: Callable returning the loaded model
+        """
+        self._loaders[name] = loader
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        """Return the model, loading it on first use"""
+        if name in self._models:
+            return self._models[name]
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name not in self._models:
+                start = time.perf_counter()
+                self._models[name] = self._loaders[name]()
+                self.load_times[name] = round(time.perf_counter() - start, 3)
+                logger.info("Loaded model %s in %.3fs", name, self.load_times[name])
+        return self._models[name]
+
+    def warmup(self, names=None):
+        """
+        Load models ahead of the first request
+
+        Args:
+            names: Models to load; all registered models if None
+
+        Returns:
+            Dict of model name -> load time in seconds
+        """
+        for name in (names if names is not None else list(self._loaders)):
+            self.get(name)
+        return dict(self.load_times)
+
+    def status(self):
+        """Which registered models are loaded, and how long each took"""
+        return {
+            name: {"loaded": self.is_loaded(name), "load_seconds": self.load_times.get(name)}
+            for name in self._loaders
+        }
+
+
+def ensure_nltk_resource(resource_path, package):
+    """
+    Make sure an NLTK resource is available, downloading it only if allowed
+
+    Args:
+        resource_path: Path passed to nltk.data.find, e.g. 'corpora/stopwords'
+        package: Package name passed to nltk.download, e.g. 'stopwords'
+    """
+    import nltk
+
+    try:
+        nltk.data.find(resource_path)
+    except LookupError:
+        if not ALLOW_MODEL_DOWNLOADS:
+            raise
+        logger.info("Downloading NLTK resource %s", package)
+        nltk.download(package, quiet=True)
+
+
+# Shared registry used by the extractor and by worker warmup
+registry = ModelRegistry()
@@ -0,0 +1,70 @@
+"""
+Deduplication cache for resume parse results
+
+The same file is often uploaded many times, so results are keyed by the
+SHA-256 of the uploaded bytes. Each entry records the extractor version
+(code + skill vocabulary) and the job dataset version it was produced with:
+a changed extractor makes the entry unusable, a changed dataset only means
+the recommendations have to be recomputed from the cached extractedInfo.
+"""
+
+import hashlib
+import os
+import time
+
+from utils.search_cache import MemoryBackend, SQLiteBackend, call_backend
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "512"))
+# Set to a file path to keep parse results in SQLite across restarts
+PARSE_CACHE_PATH = os.getenv("PARSE_CACHE_PATH")
+
+
+def content_digest(data):
+    """SHA-256 hex digest of the uploaded file contents"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ParseCache:
+    """
+    Size-bounded LRU of parse results keyed by content digest
+
+    lookup and store are coroutines: with the SQLite backend they run in a
+    thread so the upload handler's event loop is not blocked on disk I/O.
+
+    Args:
+        backend: MemoryBackend or SQLiteBackend; an in-memory LRU by default
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else MemoryBackend(PARSE_CACHE_SIZE)
+
+    async def lookup(self, digest, extractor_version):
+        """
+        Return the cached entry for digest if the current extractor produced it
+
+        Returns:
+            Dict with extractedInfo, recommendedJobs and dataset_version, or None
+        """
+        entry = await call_backend(self.backend, 'get', digest)
+        if entry is None:
+            return None
+        value, _ = entry
+        if value.get('extractor_version') != extractor_version:
+            return None
+        return value
+
+    async def store(self, digest, extractor_version, dataset_version, output_data):
+        """Cache the response for digest along with the versions that produced it"""
+        await call_backend(self.backend, 'set', digest, {
+            'extractor_version': extractor_version,
+            'dataset_version': dataset_version,
+            'extractedInfo': output_data['extractedInfo'],
+            'recommendedJobs': output_data['recommendedJobs'],
+        }, time.time())
+
+
+def build_parse_cache():
+    """ParseCache configured from the PARSE_CACHE_* environment variables"""
+    if PARSE_CACHE_PATH:
+        return ParseCache(SQLiteBackend(PARSE_CACHE_PATH, PARSE_CACHE_SIZE, table='parse_cache'))
+    return ParseCache()
@@ -0,0 +1,63 @@
+"""
+Precompiled pattern sets for field extraction
+
+A PatternSet holds a prioritized list of regexes, compiled once at import,
+and reports which of them matched. Patterns that start with a letter are
+best written lowercase and run, without re.IGNORECASE, on a text passed
+through fold_case() once: that keeps the regex engine's fast literal-prefix
+search, whereas an IGNORECASE regex, or one alternation of all the
+patterns, has to try every position of the text.
+"""
+
+import re
+
+# Letters that re.IGNORECASE equates with an ASCII letter although str.lower() keeps them
+_IGNORECASE_EQUIVALENTS = str.maketrans({'ı': 'i', 'ſ': 's'})
+
+
+def fold_case(text):
+    """
+    Lowercase text so that case-sensitive lowercase patterns match as with re.IGNORECASE
+
+    Args:
+        text: Text to fold
+
+    Returns:
+        The folded text
+    """
+    text = text.lower()
+    if not text.isascii():
+        text = text.translate(_IGNORECASE_EQUIVALENTS)
+    return text
+
+
+class PatternSet:
+    """Prioritized regexes; the first one that matches anywhere wins"""
+
+    def __init__(self, patterns, flags=0):
+        """
+        Args:
+            patterns: (pattern_id, regex) pairs, highest priority first. A
+                pattern's value is its first capturing group, or the whole
+                match if it has none
+            flags: re flags for every pattern
+        """
+        self.patterns = [(pattern_id, re.compile(regex, flags)) for pattern_id, regex in patterns]
+
+    def search(self, text):
+        """
+        Find the highest-priority pattern that matches anywhere in text
+
+        Args:
+            text: Text to search; fold it with fold_case() first when the
+                patterns are lowercase and compiled without re.IGNORECASE
+
+        Returns:
+            (pattern_id, value) of that pattern's leftmost match, or
+            (None, None) if no pattern matches
+        """
+        for pattern_id, pattern in self.patterns:
+            match = pattern.search(text)
+            if match:
+                return pattern_id, match.group(1) if pattern.groups else match.group(0)
+        return None, None
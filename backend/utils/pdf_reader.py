@@ -1,9 +1,80 @@
 import pdfplumber
+import io
 import re
 import os
+import logging
 import traceback
+import tempfile
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from PyPDF2 import PdfReader
 
+from utils.tracing import span, bind_context
+from utils.sections import segment_sections
+
+logger = logging.getLogger(__name__)
+
+# Rasterization and OCR settings for scanned PDFs
+PDF_OCR_DPI = int(os.getenv("PDF_OCR_DPI", "200"))
+PDF_OCR_GRAYSCALE = os.getenv("PDF_OCR_GRAYSCALE", "1") == "1"
+# Pages rasterized and OCR'd at once; also bounds how many page images are in memory
+PDF_OCR_WORKERS = int(os.getenv("PDF_OCR_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Pages whose text layer has fewer alphanumeric characters than this are OCR'd
+PDF_MIN_PAGE_CHARS = int(os.getenv("PDF_MIN_PAGE_CHARS", "20"))
+# Text layer backend tried first, and the one used for pages that fail the layout check
+PDF_TEXT_BACKEND = os.getenv("PDF_TEXT_BACKEND", "pypdf2")
+PDF_FALLBACK_BACKEND = os.getenv("PDF_FALLBACK_BACKEND", "pdfplumber")
+# Share of a page's characters allowed in glued tokens before it is re-read by the fallback
+PDF_GLUED_TOKEN_RATIO = float(os.getenv("PDF_GLUED_TOKEN_RATIO", "0.2"))
+GLUED_TOKEN_LENGTH = 20
+
+def read_pdf_source(pdf_source):
+    """
+    Normalize a PDF input to either a filesystem path or the PDF bytes
+    
+    Args:
+        pdf_source: Path, bytes, or a readable binary file-like object
+            (e.g. BytesIO or SpooledTemporaryFile)
+        
+    Returns:
+        str path for path inputs, bytes for everything else
+    """
+    if isinstance(pdf_source, (str, os.PathLike)):
+        return os.fspath(pdf_source)
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        return bytes(pdf_source)
+    if hasattr(pdf_source, 'seek'):
+        pdf_source.seek(0)
+    return pdf_source.read()
+
+def open_pdf_source(pdf_source):
+    """Something pdfplumber and PyPDF2 can open: the path itself or a fresh stream over the bytes"""
+    return pdf_source if isinstance(pdf_source, str) else io.BytesIO(pdf_source)
+
+@contextmanager
+def pdf_path(pdf_source):
+    """
+    A filesystem path for tools that only read files (pdftoppm, pdfinfo)
+    
+    Path inputs are used as they are. PDF bytes are written once to a
+    temporary file, which is deleted when the block exits; pdf2image's
+    *_from_bytes helpers would write a new copy on every call instead.
+    """
+    if isinstance(pdf_source, str):
+        yield pdf_source
+        return
+    spill = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+    try:
+        with spill:
+            spill.write(pdf_source)
+        yield spill.name
+    finally:
+        os.remove(spill.name)
+
+def describe_pdf_source(pdf_source):
+    """Label for log messages"""
+    return pdf_source if isinstance(pdf_source, str) else f"<in-memory PDF, {len(pdf_source)} bytes>"
+
 def clean_text(text):
     """Clean and normalize text"""
     if not text:
@@ -16,137 +87,314 @@ def clean_text(text):
     text = re.sub(r'[^\w\s.,\-]', ' ', text)
     return text.strip()
 
-def extract_text_with_pypdf2(pdf_path):
+def read_pages_with_pypdf2(pdf_source, page_numbers=None):
+    """
+    Text layer backend using PyPDF2's content-stream extraction (fast)
+    
+    Args:
+        pdf_source: Path or PDF bytes (see read_pdf_source)
+        page_numbers: 1-based pages to read; every page when None
+        
+    Returns:
+        Dict mapping page number to raw page text
+    """
+    reader = PdfReader(open_pdf_source(read_pdf_source(pdf_source)))
+    if page_numbers is None:
+        page_numbers = range(1, len(reader.pages) + 1)
+    texts = {}
+    for page_number in page_numbers:
+        try:
+            with span('extract_text.pypdf2_page', page=page_number):
+                texts[page_number] = reader.pages[page_number - 1].extract_text() or ""
+        except Exception as e:
+            logger.warning("Issue extracting text from page %d with PyPDF2: %s", page_number, e)
+            texts[page_number] = ""
+    return texts
+
+def read_pages_with_pdfplumber(pdf_source, page_numbers=None):
+    """
+    Text layer backend using pdfplumber's character layout analysis (slow, but
+    keeps word spacing on PDFs that position every glyph individually)
+    
+    Args:
+        pdf_source: Path or PDF bytes (see read_pdf_source)
+        page_numbers: 1-based pages to read; every page when None
+        
+    Returns:
+        Dict mapping page number to raw page text
+    """
+    with pdfplumber.open(open_pdf_source(read_pdf_source(pdf_source))) as pdf:
+        if page_numbers is None:
+            page_numbers = range(1, len(pdf.pages) + 1)
+        texts = {}
+        for page_number in page_numbers:
+            try:
+                # Extract text while preserving formatting
+                with span('extract_text.pdfplumber_page', page=page_number):
+                    texts[page_number] = pdf.pages[page_number - 1].extract_text(x_tolerance=3, y_tolerance=3) or ""
+            except Exception as e:
+                logger.warning("Issue extracting text from page %d with pdfplumber: %s", page_number, e)
+                texts[page_number] = ""
+    return texts
+
+# Text layer backends by name; each is called as fn(pdf_source, page_numbers=None)
+# and returns {page_number: raw text}
+TEXT_BACKENDS = {
+    'pypdf2': read_pages_with_pypdf2,
+    'pdfplumber': read_pages_with_pdfplumber,
+}
+
+def extract_text_with_pypdf2(pdf_source):
     """Extract text using PyPDF2 as a fallback method"""
     try:
-        reader = PdfReader(pdf_path)
-        text_chunks = []
-        
-        for page in reader.pages:
-            text = page.extract_text()
-            if text:
-                text_chunks.append(clean_text(text))
-                
+        page_texts = read_pages_with_pypdf2(pdf_source)
+        text_chunks = [clean_text(page_texts[number]) for number in sorted(page_texts) if page_texts[number]]
         return '\n\n'.join(text_chunks)
     except Exception as e:
-        print(f"PyPDF2 extraction failed: {str(e)}")
+        logger.warning("PyPDF2 extraction failed: %s", e)
         return ""
 
-def extract_text_with_ocr(pdf_path):
-    """Extract text using OCR as a last resort method for scanned PDFs"""
-    try:
-        # Check if pytesseract is installed
-        import importlib.util
-        tesseract_spec = importlib.util.find_spec("pytesseract")
-        pdf2image_spec = importlib.util.find_spec("pdf2image")
+def has_text_layer(text, min_chars=PDF_MIN_PAGE_CHARS):
+    """Whether a page's text layer has enough content to skip OCR for that page"""
+    return bool(text) and sum(ch.isalnum() for ch in text) >= min_chars
+
+def has_good_layout(text, max_glued_ratio=PDF_GLUED_TOKEN_RATIO):
+    """
+    Layout-quality heuristic for a page's text layer
+    
+    Fast extractors lose word spacing on PDFs that place glyphs individually,
+    producing long glued tokens ("SoftwareEngineeratAcme"), or split every
+    letter apart. Either pattern means the page should be re-read with the
+    layout-aware backend.
+    """
+    tokens = text.split()
+    total_chars = sum(len(token) for token in tokens)
+    if not total_chars:
+        return False
+    # URLs and e-mail addresses are legitimately long
+    glued_chars = sum(
+        len(token) for token in tokens
+        if len(token) >= GLUED_TOKEN_LENGTH and not any(ch in token for ch in '@/:')
+    )
+    if glued_chars / total_chars > max_glued_ratio:
+        return False
+    single_chars = sum(1 for token in tokens if len(token) == 1)
+    return single_chars / len(tokens) <= 0.5
+
+def ocr_available():
+    """Check that pytesseract and pdf2image are installed"""
+    import importlib.util
+    if importlib.util.find_spec("pytesseract") is None or importlib.util.find_spec("pdf2image") is None:
+        logger.warning(
+            "OCR extraction requires pytesseract and pdf2image (pip install pytesseract pdf2image) "
+            "and Tesseract OCR installed on the system"
+        )
+        return False
+    return True
+
+def ocr_pdf_pages(pdf_source, page_numbers, dpi=PDF_OCR_DPI, grayscale=PDF_OCR_GRAYSCALE, workers=PDF_OCR_WORKERS):
+    """
+    Rasterize and OCR the given pages of a PDF
+    
+    Pages are rasterized one at a time (first_page/last_page) and OCR'd
+    by a bounded pool, so peak memory depends on the pool size rather
+    than the page count. PDF bytes are spilled to a single temporary file
+    for the whole document (see pdf_path), which every page reads.
+    
+    Args:
+        pdf_source: Path or PDF bytes (see read_pdf_source)
+        page_numbers: 1-based page numbers to OCR
+        dpi: Rasterization resolution
+        grayscale: Rasterize pages in grayscale
+        workers: Number of pages processed concurrently
         
-        if tesseract_spec is None or pdf2image_spec is None:
-            print("OCR extraction requires pytesseract and pdf2image libraries.")
-            print("Install with: pip install pytesseract pdf2image")
-            print("You also need to install Tesseract OCR on your system.")
+    Returns:
+        Dict mapping each page number to its raw OCR text ("" if OCR failed)
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+    
+    def ocr_page(path, page_number):
+        """Rasterize a single page and OCR it, so only in-flight pages are held in memory"""
+        try:
+            with span('extract_text.ocr_page', page=page_number):
+                images = convert_from_path(path, dpi=dpi, grayscale=grayscale,
+                                           first_page=page_number, last_page=page_number)
+                text = pytesseract.image_to_string(images[0]) if images else ""
+            if text:
+                logger.debug("OCR extracted text from page %d", page_number)
+            return text
+        except Exception as e:
+            logger.warning("OCR failed on page %d: %s", page_number, e)
             return ""
+    
+    page_numbers = list(page_numbers)
+    with pdf_path(pdf_source) as path:
+        # pdftoppm and tesseract run as subprocesses, so a thread pool
+        # rasterizes and OCRs several pages in parallel
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            texts = executor.map(bind_context(ocr_page), [path] * len(page_numbers), page_numbers)
+            return dict(zip(page_numbers, texts))
+
+def extract_text_with_ocr(pdf_source, dpi=PDF_OCR_DPI, grayscale=PDF_OCR_GRAYSCALE, workers=PDF_OCR_WORKERS):
+    """
+    Extract text using OCR as a last resort method for scanned PDFs
+    
+    Args:
+        pdf_source: Path, bytes, or a readable binary file-like object
+        dpi: Rasterization resolution
+        grayscale: Rasterize pages in grayscale
+        workers: Number of pages processed concurrently
+    """
+    try:
+        if not ocr_available():
+            return ""
+        from pdf2image import pdfinfo_from_path
         
-        # Import the required libraries
-        import pytesseract
-        from pdf2image import convert_from_path
-        
-        print(f"Attempting OCR extraction on {pdf_path}...")
+        pdf_source = read_pdf_source(pdf_source)
+        logger.info("Attempting OCR extraction on %s", describe_pdf_source(pdf_source))
         
-        # Convert PDF pages to images
-        images = convert_from_path(pdf_path)
-        text_chunks = []
+        # One temporary copy of in-memory PDFs serves both pdfinfo and every page
+        with pdf_path(pdf_source) as path:
+            # Count pages without rasterizing anything
+            page_count = pdfinfo_from_path(path)["Pages"]
+            page_texts = ocr_pdf_pages(path, range(1, page_count + 1), dpi, grayscale, workers)
         
-        # Extract text from each image using OCR
-        for i, img in enumerate(images):
-            try:
-                text = pytesseract.image_to_string(img)
-                if text:
-                    text_chunks.append(clean_text(text))
-                    print(f"OCR extracted text from page {i+1}")
-            except Exception as e:
-                print(f"OCR failed on page {i+1}: {str(e)}")
+        # Keep page order
+        text_chunks = [clean_text(page_texts[number]) for number in sorted(page_texts) if page_texts[number]]
                 
         if not text_chunks:
-            print("OCR extraction failed to extract any text")
+            logger.warning("OCR extraction failed to extract any text")
             return ""
             
         return '\n\n'.join(text_chunks)
         
     except Exception as e:
-        print(f"OCR extraction failed: {str(e)}")
+        logger.warning("OCR extraction failed: %s", e)
         return ""
 
-def extract_text_from_pdf(pdf_path, try_ocr=True):
-    """Extract text from PDF with improved formatting preservation"""
+def extract_pdf_pages(pdf_source, try_ocr=True, backend=None, fallback_backend=None):
+    """
+    Extract text page by page, using the cheapest backend that gives usable text
+    
+    Every page is read with the primary text backend (PyPDF2 by default).
+    Pages whose text is missing or fails the layout check are re-read with
+    the fallback backend (pdfplumber by default), and pages that still have
+    no text layer are rasterized and OCR'd individually. The document is
+    opened once per backend that is actually needed.
+    
+    Args:
+        pdf_source: Path, bytes, or a readable binary file-like object
+        try_ocr: OCR pages that have no usable text layer
+        backend: Name in TEXT_BACKENDS; defaults to PDF_TEXT_BACKEND
+        fallback_backend: Name in TEXT_BACKENDS, or "" to disable; defaults to PDF_FALLBACK_BACKEND
+        
+    Returns:
+        List of dicts in page order with 'page' (1-based), 'text' (cleaned)
+        and 'backend' (a TEXT_BACKENDS name, 'ocr' or 'none')
+    """
+    pdf_source = read_pdf_source(pdf_source)
+    backend = backend or PDF_TEXT_BACKEND
+    fallback_backend = PDF_FALLBACK_BACKEND if fallback_backend is None else fallback_backend
+    
+    try:
+        layer_texts = TEXT_BACKENDS[backend](pdf_source)
+    except Exception as e:
+        logger.warning("Error with %s: %s; trying fallback method", backend, e)
+        layer_texts = None
+        if fallback_backend and fallback_backend != backend:
+            try:
+                layer_texts = TEXT_BACKENDS[fallback_backend](pdf_source)
+                backend, fallback_backend = fallback_backend, ""
+            except Exception as e:
+                logger.warning("Error with %s: %s", fallback_backend, e)
+        if layer_texts is None:
+            text = extract_text_with_ocr(pdf_source) if try_ocr else ""
+            # Page boundaries are unknown here, so the whole document is one entry
+            return [{'page': 1, 'text': text, 'backend': 'ocr'}] if text else []
+    
+    # Keep pages whose text layer is usable as it is
+    pages = []
+    for page_number in sorted(layer_texts):
+        text = clean_text(layer_texts[page_number])
+        usable = has_text_layer(text) and has_good_layout(text)
+        pages.append({'page': page_number, 'text': text, 'backend': backend if usable else 'none'})
+    
+    # Re-read the rest with the layout-aware fallback
+    retry = [page['page'] for page in pages if page['backend'] == 'none']
+    if retry and fallback_backend and fallback_backend != backend:
+        try:
+            fallback_texts = TEXT_BACKENDS[fallback_backend](pdf_source, retry)
+        except Exception as e:
+            logger.warning("Error with %s: %s", fallback_backend, e)
+            fallback_texts = {}
+        for page in pages:
+            text = clean_text(fallback_texts.get(page['page'], ""))
+            if page['backend'] == 'none' and has_text_layer(text):
+                page['text'] = text
+                page['backend'] = fallback_backend
+    
+    # OCR pages with no text layer at all
+    scanned = [page['page'] for page in pages if page['backend'] == 'none' and not has_text_layer(page['text'])]
+    if scanned and try_ocr and ocr_available():
+        logger.info("Pages %s have no text layer, running OCR on them", scanned)
+        ocr_texts = ocr_pdf_pages(pdf_source, scanned)
+        for page in pages:
+            ocr_text = clean_text(ocr_texts.get(page['page'], ""))
+            if ocr_text:
+                page['text'] = ocr_text
+                page['backend'] = 'ocr'
+    
+    # Imperfect text is still better than nothing when nothing else helped
+    for page in pages:
+        if page['backend'] == 'none' and page['text']:
+            page['backend'] = backend
+    return pages
+
+def extract_text_from_pdf(pdf_source, try_ocr=True, page_report=None):
+    """
+    Extract text from PDF with improved formatting preservation
+    
+    Args:
+        pdf_source: Path, bytes, or a readable binary file-like object
+        try_ocr: OCR pages that have no text layer
+        page_report: Optional list that receives a {'page', 'backend'} dict per page
+    """
+    pdf_source = read_pdf_source(pdf_source)
+    source_label = describe_pdf_source(pdf_source)
     try:
         # First check if file exists
-        if not os.path.exists(pdf_path):
-            print(f"Error: PDF file not found at {pdf_path}")
+        if isinstance(pdf_source, str) and not os.path.exists(pdf_source):
+            logger.error("PDF file not found at %s", source_label)
             return ""
             
         # Check file size - empty or too small files might be corrupt
-        file_size = os.path.getsize(pdf_path)
+        file_size = os.path.getsize(pdf_source) if isinstance(pdf_source, str) else len(pdf_source)
         if file_size < 100:  # Arbitrary small size threshold
-            print(f"Warning: PDF file is very small ({file_size} bytes), might be corrupt")
+            logger.warning("PDF file is very small (%d bytes), might be corrupt", file_size)
             
-        full_text = []
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page in pdf.pages:
-                    try:
-                        # Extract text while preserving formatting
-                        text = page.extract_text(x_tolerance=3, y_tolerance=3)
-                        if text:
-                            # Clean the text
-                            text = clean_text(text)
-                            full_text.append(text)
-                    except Exception as e:
-                        print(f"Warning: Issue extracting text from page in PDF: {str(e)}")
-                        continue
-        except Exception as e:
-            print(f"Error with pdfplumber: {str(e)}")
-            print("Trying fallback method...")
-
+        pages = extract_pdf_pages(pdf_source, try_ocr=try_ocr)
+        if page_report is not None:
+            page_report.extend({'page': page['page'], 'backend': page['backend']} for page in pages)
+        logger.info("Extracted %d pages from %s", len(pages), source_label,
+                    extra={'page_backends': {page['page']: page['backend'] for page in pages}})
+        
+        full_text = [page['text'] for page in pages if page['text']]
         if not full_text:
-            print(f"Warning: No text could be extracted from {pdf_path} with pdfplumber. Trying PyPDF2...")
-            fallback_text = extract_text_with_pypdf2(pdf_path)
-            if fallback_text:
-                print(f"Successfully extracted text using PyPDF2 fallback for {pdf_path}")
-                full_text = [fallback_text]
-            elif try_ocr:
-                print(f"Warning: No text could be extracted with standard methods for {pdf_path}")
-                print("This PDF might be scanned/image-based or encrypted. Trying OCR...")
-                ocr_text = extract_text_with_ocr(pdf_path)
-                if ocr_text:
-                    print(f"Successfully extracted text using OCR for {pdf_path}")
-                    return ocr_text
-                else:
-                    print(f"Failed to extract text from {pdf_path} with any method.")
-                    return ""
-            else:
-                print(f"Warning: No text could be extracted from {pdf_path} with any method.")
-                return ""
+            logger.warning("No text could be extracted from %s with any method", source_label)
+            return ""
             
         # Join all pages with proper spacing
         final_text = '\n\n'.join(full_text)
 
         # Add section markers if they don't exist
+        # One scan finds every heading; prepending a marker adds no other heading
+        section_map = segment_sections(final_text)
         sections = ['EDUCATION', 'EXPERIENCE', 'SKILLS', 'PROJECTS']
         for section in sections:
-            if section.lower() not in final_text.lower():
+            if section not in section_map:
                 # Look for alternative headings
-                alternatives = {
-                    'EDUCATION': ['ACADEMIC BACKGROUND', 'EDUCATIONAL QUALIFICATIONS', 'QUALIFICATION', 'DEGREE', 'UNIVERSITY'],
-                    'EXPERIENCE': ['WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'INTERNSHIPS', 'WORK EXPERIENCE', 'EMPLOYMENT'],
-                    'SKILLS': ['TECHNICAL SKILLS', 'CORE COMPETENCIES', 'TECHNOLOGIES', 'EXPERTISE', 'PROFICIENCY'],
-                    'PROJECTS': ['PROJECT WORK', 'ACADEMIC PROJECTS', 'PERSONAL PROJECTS', 'KEY PROJECTS', 'RESEARCH']
-                }
-                
-                found = False
-                for alt in alternatives[section]:
-                    if alt.lower() in final_text.lower():
-                        found = True
-                        break
+                found = section_map.has_section(section)
                 
                 if not found:
                     # Try to identify section content and add appropriate heading
@@ -162,17 +410,7 @@ def extract_text_from_pdf(pdf_path, try_ocr=True):
         return final_text
 
     except Exception as e:
-        print(f"Error reading PDF {pdf_path}: {str(e)}")
-        print(f"Stack trace: {traceback.format_exc()}")
-        # Try the fallback method
-        print("Attempting to extract with fallback method...")
-        fallback_text = extract_text_with_pypdf2(pdf_path)
-        if fallback_text:
-            print("Fallback extraction successful")
-            return fallback_text
-        elif try_ocr:
-            print("Regular extraction methods failed. Attempting OCR...")
-            return extract_text_with_ocr(pdf_path)
+        logger.exception("Error reading PDF %s: %s", source_label, e)
         return ""
 
 def debug_pdf_extraction(pdf_path):
@@ -18,129 +18,437 @@
 
 """
 
+from collections import Counter
+from functools import cached_property
+import hashlib
+import logging
+
 import numpy as np
+import pandas as pd
+from scipy import sparse
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
-def recommend_jobs(user_skills, df, top_n=10):
+from utils.job_dataset import artifact_status, default_artifact_path, read_artifact, write_artifact
+
+logger = logging.getLogger(__name__)
+
+# Job titles in the dataset that are placeholders rather than real roles
+INVALID_JOB_TITLES = ["No additional information found", "No additional information"]
+
+
+def parse_skills(skills):
+    """
+    Turn a dataset skills cell into a list of lowercase skill names
+
+    Args:
+        skills: Comma-joined skills string or an already split list
+
+    Returns:
+        List of stripped, lowercase skills
+    """
+    if isinstance(skills, str):
+        skills = skills.replace('"', '').split(',')
+    return [skill.strip().lower() for skill in skills if skill and skill.strip()]
+
+
+class JobIndex:
+    """
+    Read-only view of the job-skill dataset, built once and shared by all requests
+
+    Skill names are interned to integer IDs and jobs with identical skill
+    lists share one skill group, stored as a CSR row of skill IDs, with a
+    sparse group x skill incidence matrix so that nothing has to be re-parsed
+    per upload. Python lists and sets of a group's skills are only built when
+    a recommendation needs them. ``version`` is a short hash of the dataset
+    contents.
+
+    An index opened from a compiled artifact keeps every array memory-mapped
+    and also carries the fitted scoring data in ``scoring``.
+    """
+
+    def __init__(self, titles, skills_lists):
+        titles = list(titles)
+        # Intern skills in order of first appearance, and deduplicate whole skill lists
+        skill_ids = {}
+        groups = {}
+        job_groups = []
+        # Content hash, so caches of derived results can tell when the dataset changed
+        digest = hashlib.sha256()
+        for title, skills in zip(titles, skills_lists):
+            key = tuple(skill_ids.setdefault(skill, len(skill_ids)) for skill in skills)
+            job_groups.append(groups.setdefault(key, len(groups)))
+            digest.update((title + '\0' + ','.join(skills) + '\n').encode('utf-8'))
+
+        group_indptr = np.zeros(len(groups) + 1, dtype=np.int64)
+        group_indptr[1:] = np.cumsum([len(key) for key in groups])
+        group_indices = np.fromiter((skill for key in groups for skill in key), dtype=np.int32, count=group_indptr[-1])
+
+        # Group x skill incidence (a skill repeated within a list counts once)
+        group_rows = np.repeat(np.arange(len(groups)), np.diff(group_indptr))
+        group_matrix = sparse.csr_matrix(
+            (np.ones(len(group_indices), dtype=np.float32), (group_rows, group_indices)),
+            shape=(len(groups), len(skill_ids))
+        )
+        group_matrix.data[:] = 1
+
+        self._setup(titles, list(skill_ids), group_indptr, group_indices,
+                    np.asarray(job_groups, dtype=np.int32), group_matrix, digest.hexdigest()[:12])
+
+    def _setup(self, titles, skill_names, group_indptr, group_indices, job_groups, group_matrix, version,
+               scoring=None):
+        """Attach the interned form shared with the compiled artifact"""
+        self.titles = titles
+        self.skill_names = skill_names
+        self.group_indptr = group_indptr
+        self.group_indices = group_indices
+        self.job_groups = job_groups
+        self.group_matrix = group_matrix
+        self.version = version
+        # (vocabulary, group vectors, group norms) fitted at build time, or None to fit on startup
+        self.scoring = scoring
+        self._group_sets = {}
+
+    def __len__(self):
+        return len(self.titles)
+
+    @property
+    def group_count(self):
+        """Number of distinct skill lists"""
+        return len(self.group_indptr) - 1
+
+    @cached_property
+    def skill_ids(self):
+        return {skill: column for column, skill in enumerate(self.skill_names)}
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """
+        Build the index from a DataFrame with job_title and skills columns
+
+        Args:
+            df: DataFrame containing job title and required skills
+
+        Returns:
+            JobIndex over all valid job rows
+        """
+        filtered_df = df[~df['job_title'].isin(INVALID_JOB_TITLES)]
+        return cls(
+            filtered_df['job_title'].tolist(),
+            [parse_skills(skills) for skills in filtered_df['skills']]
+        )
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Build the index from the job skills CSV file
+
+        Args:
+            path: Path to job_skill_dataset.csv
+
+        Returns:
+            JobIndex over all valid job rows
+        """
+        return cls.from_dataframe(pd.read_csv(path))
+
+    @classmethod
+    def from_artifact(cls, path):
+        """
+        Open a dataset compiled by ``python -m utils.job_dataset``
+
+        Every array, including the fitted vectors, stays memory-mapped, so
+        worker processes share them through the page cache.
+
+        Args:
+            path: Artifact directory
+
+        Returns:
+            JobIndex equal to the one built from the source CSV
+        """
+        artifact = read_artifact(path)
+        index = cls.__new__(cls)
+        index._setup(artifact['titles'], artifact['skill_names'], artifact['group_indptr'],
+                     artifact['group_indices'], artifact['job_groups'], artifact['incidence'],
+                     artifact['meta']['version'],
+                     scoring=(artifact['vocabulary'], artifact['vectors'], artifact['norms']))
+        return index
+
+    @classmethod
+    def load(cls, csv_path, artifact_path=None):
+        """
+        Build the index from the compiled artifact if it is current, else from the CSV
+
+        Args:
+            csv_path: Path to job_skill_dataset.csv
+            artifact_path: Artifact directory; defaults to the CSV path with an .index suffix
+
+        Returns:
+            JobIndex over all valid job rows
+        """
+        artifact_path = artifact_path or default_artifact_path(csv_path)
+        reason = artifact_status(csv_path, artifact_path)
+        if reason is None:
+            return cls.from_artifact(artifact_path)
+        logger.info("Job dataset artifact %s %s; parsing %s (build it with python -m utils.job_dataset)",
+                    artifact_path, reason, csv_path)
+        return cls.from_csv(csv_path)
+
+    def save(self, path, source_sha256=None):
+        """
+        Write the index and its fitted scoring data as a memory-mappable artifact (see utils.job_dataset)
+
+        Args:
+            path: Artifact directory
+            source_sha256: Digest of the CSV the index was built from
+        """
+        engine = RecommenderEngine(self)
+        write_artifact(
+            path,
+            strings={
+                'titles': self.titles,
+                'skill_names': self.skill_names,
+                'vocabulary': engine.vectorizer.get_feature_names_out().tolist(),
+            },
+            arrays={
+                'group_indptr': self.group_indptr,
+                'group_indices': self.group_indices,
+                'job_groups': self.job_groups,
+                'norms': engine.group_norms,
+            },
+            matrices={'incidence': self.group_matrix, 'vectors': engine.group_vectors},
+            meta={'version': self.version, 'source_sha256': source_sha256},
+        )
+
+    def group_skills(self, group):
+        """Skill names of a distinct skill list, in dataset order"""
+        start, end = self.group_indptr[group], self.group_indptr[group + 1]
+        return [self.skill_names[skill] for skill in self.group_indices[start:end]]
+
+    def skill_set(self, row):
+        """Set of the skills the job at ``row`` requires, built on first use"""
+        group = int(self.job_groups[row])
+        skills = self._group_sets.get(group)
+        if skills is None:
+            skills = self._group_sets[group] = set(self.group_skills(group))
+        return skills
+
+    def skill_vector(self, user_skills):
+        """
+        Encode user skills as a 1 x n_skills indicator row of the incidence matrix
+
+        Skills the dataset has never seen are dropped.
+        """
+        cols = sorted({self.skill_ids[s] for s in user_skills if s in self.skill_ids})
+        return sparse.csr_matrix(
+            (np.ones(len(cols), dtype=np.float32), ([0] * len(cols), cols)),
+            shape=(1, len(self.skill_ids))
+        )
+
+    def matching_skills(self, user_skills, row):
+        """Return the user skills that the job at ``row`` also requires"""
+        return list(set(user_skills) & self.skill_set(row))
+
+
+class RecommenderEngine:
+    """
+    Job-side vectors fitted once over a JobIndex
+
+    The CountVectorizer vocabulary, the document-term matrix of the distinct
+    skill lists and their L2 norms are computed once, so scoring a resume is
+    a single transform of its skills plus one sparse mat-vec. An index opened
+    from an artifact supplies them already fitted and memory-mapped.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        if index.scoring is not None:
+            vocabulary, self.group_vectors, self.group_norms = index.scoring
+            self.vectorizer = CountVectorizer(
+                ngram_range=(1,2), lowercase=True,
+                vocabulary={term: column for column, term in enumerate(vocabulary)}
+            )
+        else:
+            self.vectorizer = CountVectorizer(ngram_range=(1,2), lowercase=True)
+            # Each distinct skill list is vectorized once; jobs take their group's scores
+            group_texts = [" ".join(index.group_skills(group)) for group in range(index.group_count)]
+            self.group_vectors = self.vectorizer.fit_transform(group_texts).astype(np.float64).tocsr()
+            self.group_norms = np.sqrt(np.asarray(self.group_vectors.multiply(self.group_vectors).sum(axis=1)).ravel())
+        self._analyzer = self.vectorizer.build_analyzer()
+
+    def query_norm(self, user_skills_text):
+        """
+        L2 norm of the user's n-gram counts
+
+        Computed from the analyzer rather than the transformed vector so that
+        n-grams outside the job vocabulary still count, matching a vectorizer
+        fitted on the user text together with the jobs.
+        """
+        counts = Counter(self._analyzer(user_skills_text))
+        return float(np.sqrt(sum(c * c for c in counts.values())))
+
+    def similarities(self, user_skills):
+        """
+        Cosine similarity between the user skills and every job in the index
+
+        Args:
+            user_skills: List of user skills extracted from resume
+
+        Returns:
+            1-D numpy array with one score in [0, 1] per job
+        """
+        return self.batch_similarities([user_skills])[0]
+
+    def batch_similarities(self, skill_lists):
+        """
+        Cosine similarity between many skill lists and every job in one multiply
+
+        Args:
+            skill_lists: List of user skill lists, one per resume
+
+        Returns:
+            2-D numpy array of shape (len(skill_lists), number of jobs)
+        """
+        texts = [" ".join([s.lower() for s in skills]) for skills in skill_lists]
+        user_norms = np.array([self.query_norm(text) for text in texts], dtype=np.float64)
+
+        # Stack every query into one sparse matrix and score them all at once
+        user_vectors = self.vectorizer.transform(texts)
+        dots = (user_vectors @ self.group_vectors.T).toarray()
+        denominators = np.outer(user_norms, self.group_norms)
+        scores = np.divide(dots, denominators, out=np.zeros_like(dots), where=denominators > 0)
+        return scores[:, self.index.job_groups]
+
+
+def _top_recommendations(index, similarities, user_skills_set, top_n):
+    """
+    Turn one row of similarity scores into the sorted top-N recommendations
+
+    Args:
+        index: JobIndex the scores were computed against
+        similarities: 1-D array with one cosine score per job
+        user_skills_set: Lowercase user skills, used for matching_skills
+        top_n: Number of top recommendations to return
+
+    Returns:
+        List of dicts with job title, similarity score and matching skills
+    """
+    if top_n <= 0:
+        return []
+    candidates = np.flatnonzero(similarities > 0)
+    if len(candidates) > top_n:
+        # Partial selection of the N best scores; anything within 0.01% of the
+        # N-th best may still tie after rounding, so keep it for the final sort
+        top = candidates[np.argpartition(-similarities[candidates], top_n - 1)[:top_n]]
+        cutoff = similarities[top].min() - 1e-4
+        candidates = candidates[similarities[candidates] >= cutoff]
+
+    # Create recommendations with similarity scores
+    recommendations = []
+    for i in candidates:
+        recommendations.append({
+            'title': index.titles[i],
+            'similarity_score': round(float(similarities[i]) * 100, 2),  # Convert to percentage
+            'matching_skills': index.matching_skills(user_skills_set, i)
+        })
+
+    # Sort by similarity score (highest first)
+    recommendations.sort(
+    key=lambda x: (x["similarity_score"], len(x["matching_skills"])),
+    reverse=True
+    )
+
+    return recommendations[:top_n]
+
+
+def _as_engine(jobs):
+    """Accept a raw index or DataFrame for callers that have not built an engine"""
+    if isinstance(jobs, RecommenderEngine):
+        return jobs
+    return RecommenderEngine(jobs if isinstance(jobs, JobIndex) else JobIndex.from_dataframe(jobs))
+
+
+def recommend_jobs(user_skills, jobs, top_n=10):
     """
     Recommend jobs based on user skills using cosine similarity
     
     Args:
         user_skills: List of user skills extracted from resume
-        df: DataFrame containing job title and required skills
+        jobs: Prebuilt RecommenderEngine, JobIndex or DataFrame with job title and required skills
         top_n: Number of top recommendations to return
         
     Returns:
         List of dicts with job title and matching skills
     """
-    # Filter out invalid job titles
-    invalid_job_titles = ["No additional information found", "No additional information"]
-    
-    # Create a filtered dataframe without invalid job titles
-    filtered_df = df[~df['job_title'].isin(invalid_job_titles)].copy()
+    engine = _as_engine(jobs)
+    index = engine.index
     
     # If no skills found, return empty list
     if not user_skills:
         return []
     
-    # Convert user skills to a single string for vectorization
-    user_skills_text = " ".join([s.lower() for s in user_skills])
-
-    # Process job skills from the dataset
-    job_skills_texts = []
-    job_titles = []
-    all_skills_lists = []
+    user_skills_set = set([s.lower() for s in user_skills])
     
-    for _, row in filtered_df.iterrows():
-        # Process skills string into a list
-        if isinstance(row['skills'], str):
-            job_skills_str = row['skills'].replace('"', '')
-            job_skills = [skill.strip() for skill in job_skills_str.split(',')]
-        else:
-            job_skills = row['skills']
-        
-        # Convert to lowercase for better matching
-        job_skills = [skill.lower() for skill in job_skills]
-        
-        # Store the job title and skills
-        job_titles.append(row['job_title'])
-        job_skills_text = " ".join(job_skills)
-        job_skills_texts.append(job_skills_text)
-        all_skills_lists.append(job_skills)
-    
-    # Use ML approach: Convert skills to vectors using CountVectorizer
-    # This creates a document-term matrix where each skill is a feature
-    vectorizer = CountVectorizer(ngram_range=(1,2), lowercase=True)
-    
-    # Combine user skills and job skills for vectorization
-    all_texts = [user_skills_text] + job_skills_texts
-    
-    # Transform skills into a numerical matrix
+    # Score against the prefitted job vectors
+    # Cosine similarity measures the angle between vectors, giving a score from 0-1
+    # Higher values indicate greater similarity
     try:
-        # Fit and transform the vectorizer on all skill texts
-        skills_matrix = vectorizer.fit_transform(all_texts)
-        
-        # User skills vector is the first row in the matrix
-        user_vector = skills_matrix[0]
-        
-        # Job skills vectors are the remaining rows
-        job_vectors = skills_matrix[1:]
-        
-        # Calculate cosine similarity between user skills and each job's skills
-        # Cosine similarity measures the angle between vectors, giving a score from 0-1
-        # Higher values indicate greater similarity
-        similarities = cosine_similarity(user_vector, job_vectors).flatten()
+        similarities = engine.similarities(user_skills)
         
-        # Create recommendations with similarity scores
-        recommendations = []
-        for i, similarity in enumerate(similarities):
-            # Only include if there's some similarity
-            if similarity > 0:
-                # Extract matching skills
-                user_skills_set = set([s.lower() for s in user_skills])
-                job_skills_set = set(all_skills_lists[i])
-                matching_skills = list(user_skills_set.intersection(job_skills_set))
-                
-                # Create recommendation entry
-                recommendations.append({
-                    'title': job_titles[i],
-                    'similarity_score': round(float(similarity) * 100, 2),  # Convert to percentage
-                    'matching_skills': matching_skills
-                })
-        
-        # Sort by similarity score (highest first)
-        recommendations.sort(
-        key=lambda x: (x["similarity_score"], len(x["matching_skills"])),
-        reverse=True
-        )
-        
-        return recommendations[:top_n]
+        return _top_recommendations(index, similarities, user_skills_set, top_n)
     
     except Exception as e:
         # Fallback to a simpler approach if vectorization fails
-        print(f"Warning: Cosine similarity calculation failed: {str(e)}")
-        print("Using fallback matching method")
+        logger.warning("Cosine similarity calculation failed (%s), using fallback matching method", e)
         
-        # Simple fallback matching
-        recommendations = []
-        user_skills_set = set([s.lower() for s in user_skills])
+        # Simple fallback matching: count shared skills with one sparse product
+        group_counts = np.asarray(
+            (index.group_matrix @ index.skill_vector(user_skills_set).T).todense()
+        ).ravel()
+        match_counts = group_counts[index.job_groups]
         
-        for i, job_skills in enumerate(all_skills_lists):
-            job_skills_set = set([s.lower() for s in job_skills])
-            matching_skills = list(user_skills_set.intersection(job_skills_set))
+        recommendations = []
+        for i in np.flatnonzero(match_counts > 0):
+            # Calculate simple match ratio
+            match_ratio = match_counts[i] / max(len(user_skills_set), len(index.skill_set(i)))
             
-            if len(matching_skills) > 0:
-                # Calculate simple match ratio
-                match_ratio = len(matching_skills) / max(len(user_skills_set), len(job_skills_set))
-                
-                recommendations.append({
-                    'title': job_titles[i],
-                    'similarity_score': round(match_ratio * 100, 2),
-                    'matching_skills': matching_skills
-                })
+            recommendations.append({
+                'title': index.titles[i],
+                'similarity_score': round(float(match_ratio) * 100, 2),
+                'matching_skills': index.matching_skills(user_skills_set, i)
+            })
         
         # Sort by match ratio
         recommendations = sorted(recommendations, key=lambda x: x['similarity_score'], reverse=True)
         
         return recommendations[:top_n]
+
+
+def recommend_jobs_batch(skill_lists, jobs, top_n=10):
+    """
+    Recommend jobs for many resumes at once
+
+    All skill lists are vectorized into one sparse matrix and scored against
+    every job with a single multiply, instead of one recommend_jobs call each.
+
+    Args:
+        skill_lists: List of user skill lists, one per resume
+        jobs: Prebuilt RecommenderEngine, JobIndex or DataFrame with job title and required skills
+        top_n: Number of top recommendations to return per resume
+
+    Returns:
+        List with one recommend_jobs-style result list per input skill list
+    """
+    engine = _as_engine(jobs)
+    if not skill_lists:
+        return []
+
+    similarities = engine.batch_similarities(skill_lists)
+
+    results = []
+    for user_skills, row in zip(skill_lists, similarities):
+        # Same contract as recommend_jobs: no skills means no recommendations
+        if not user_skills:
+            results.append([])
+            continue
+        user_skills_set = set([s.lower() for s in user_skills])
+        results.append(_top_recommendations(engine.index, row, user_skills_set, top_n))
+    return results
@@ -0,0 +1,130 @@
+"""
+Resume text normalized and tokenized once, shared by every extractor
+
+A ResumeDocument wraps one text (a whole resume or one of its sections) and
+computes each derived view the first time an extractor asks for it: the
+lowercase text, the section map, the punctuation-free normalized text, its
+tokens and n-grams, and the spaCy entity spans. Extractors that receive the same document reuse
+those views instead of lowercasing, normalizing and tokenizing again.
+"""
+
+import re
+from functools import cached_property
+
+from utils.model_registry import registry
+from utils.sections import segment_sections
+
+PUNCTUATION = re.compile(r'[^\w\s]')
+WHITESPACE = re.compile(r'\s+')
+
+# NLTK's word_tokenize also splits these contractions (its MacIntyre list).
+# They are the only rules of its tokenizer that apply once punctuation is
+# removed, so splitting on whitespace after them gives the same tokens.
+CONTRACTIONS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'\b(can)(not)\b',
+    r'\b(gim)(me)\b',
+    r'\b(gon)(na)\b',
+    r'\b(got)(ta)\b',
+    r'\b(lem)(me)\b',
+    r'\b(wan)(na)(?=\s)',
+)]
+
+
+def normalize_text(text):
+    """
+    Remove punctuation, lowercase and collapse whitespace
+
+    Args:
+        text: Raw text to normalize
+
+    Returns:
+        Normalized text, words separated by single spaces
+    """
+    text = PUNCTUATION.sub(' ', text).lower()
+    return WHITESPACE.sub(' ', text).strip()
+
+
+def tokenize_normalized(text):
+    """
+    Split normalize_text() output into word tokens
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        List of tokens, as NLTK word_tokenize would return for the same text
+    """
+    # Padded like NLTK does, so a trailing 'wanna' is split as well
+    text = f' {text} '
+    for contraction in CONTRACTIONS:
+        text = contraction.sub(r' \1 \2 ', text)
+    return text.split()
+
+
+class ResumeDocument:
+    """One resume text and the views of it the extractors need, each computed once"""
+
+    def __init__(self, text, nlp_doc=None):
+        """
+        Args:
+            text: The text to extract from
+            nlp_doc: spaCy Doc for text if it was already parsed (e.g. by nlp.pipe)
+        """
+        self.text = text
+        self._nlp_doc = nlp_doc
+        self._ngrams = {}
+
+    @cached_property
+    def lower(self):
+        """The text lowercased, with the original character offsets"""
+        return self.text.lower()
+
+    @cached_property
+    def normalized(self):
+        """Lowercase text with punctuation removed and whitespace collapsed"""
+        return normalize_text(self.text)
+
+    @cached_property
+    def sections(self):
+        """SectionMap of the text, from a single scan for headings"""
+        return segment_sections(self.text)
+
+    @cached_property
+    def tokens(self):
+        """Word tokens of the normalized text"""
+        return tokenize_normalized(self.normalized)
+
+    def ngrams(self, n):
+        """
+        Space-joined runs of n consecutive tokens
+
+        Args:
+            n: Number of tokens per n-gram
+
+        Returns:
+            List of n-grams in text order
+        """
+        if n not in self._ngrams:
+            tokens = self.tokens
+            if n == 1:
+                self._ngrams[n] = tokens
+            else:
+                self._ngrams[n] = [' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)]
+        return self._ngrams[n]
+
+    @property
+    def nlp_doc(self):
+        """spaCy Doc of the original text, parsed with the NER pipeline on first use"""
+        if self._nlp_doc is None:
+            self._nlp_doc = registry.get('spacy_ner')(self.text)
+        return self._nlp_doc
+
+    @cached_property
+    def entities(self):
+        """
+        Entity spans of the text
+
+        Returns:
+            List of (lowercase text, label, start char, end char) tuples
+        """
+        return [(ent.text.lower(), ent.label_, ent.start_char, ent.end_char) for ent in self.nlp_doc.ents]
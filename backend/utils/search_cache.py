@@ -0,0 +1,206 @@
+"""
+TTL + LRU cache for job search responses
+
+Entries are keyed by a normalized (title, results_per_page) pair. Fresh
+entries are served directly; entries past their TTL but still inside the
+stale window are served immediately while a background task refreshes them.
+Storage is an in-memory LRU by default, or SQLite so results survive restarts.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_STALE_TTL = float(os.getenv("SEARCH_CACHE_STALE_TTL", "3600"))
+SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+# Set to a file path to keep the cache in SQLite across restarts
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH")
+
+
+def normalize_key(title, results_per_page):
+    """Cache key that ignores case and whitespace differences in the title"""
+    return f"{' '.join(title.lower().split())}|{int(results_per_page)}"
+
+
+class MemoryBackend:
+    """Bounded in-memory LRU storage of (value, stored_at) pairs"""
+
+    # Dict operations only; safe to call on the event loop
+    blocking = False
+
+    def __init__(self, max_entries=SEARCH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key, value, stored_at):
+        self._entries[key] = (value, stored_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """On-disk LRU storage; values are stored as JSON"""
+
+    # Queries, JSON encoding and commits block; run them in a thread from async code
+    blocking = True
+
+    def __init__(self, path, max_entries=SEARCH_CACHE_SIZE, table="search_cache"):
+        self.max_entries = max_entries
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0]), row[1]
+
+    def set(self, key, value, stored_at):
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), stored_at, time.time())
+            )
+            # Evict the least recently used rows beyond the size bound
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN ("
+                f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+async def call_backend(backend, method, *args):
+    """
+    Call a storage backend method from async code
+
+    Blocking backends run in a worker thread so that disk I/O never stalls the
+    event loop; in-memory ones are called directly.
+
+    Args:
+        backend: MemoryBackend or SQLiteBackend
+        method: Name of the method to call, e.g. 'get' or 'set'
+        *args: Arguments for the method
+
+    Returns:
+        The method's return value
+    """
+    function = getattr(backend, method)
+    if backend.blocking:
+        return await asyncio.to_thread(function, *args)
+    return function(*args)
+
+
+class ResponseCache:
+    """
+    Stale-while-revalidate cache in front of an async fetch function
+
+    Args:
+        backend: MemoryBackend or SQLiteBackend
+        ttl: Seconds an entry is served without refreshing
+        stale_ttl: Extra seconds an expired entry may still be served while it is refreshed
+    """
+
+    def __init__(self, backend, ttl=SEARCH_CACHE_TTL, stale_ttl=SEARCH_CACHE_STALE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._inflight = {}
+
+    def _fetch_once(self, key, fetch):
+        """Start fetch() for key unless one is already running, and store its result"""
+        task = self._inflight.get(key)
+        if task is None:
+            async def run():
+                try:
+                    value = await fetch()
+                    await call_backend(self.backend, 'set', key, value, time.time())
+                    return value
+                finally:
+                    self._inflight.pop(key, None)
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+        return task
+
+    async def get_or_fetch(self, key, fetch):
+        """
+        Return the cached value for key, calling fetch() on a miss
+
+        Args:
+            key: Normalized cache key (see normalize_key)
+            fetch: Zero-argument coroutine function; it should raise on failure
+                so that errors are not cached
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        entry = await call_backend(self.backend, 'get', key)
+        if entry is not None:
+            value, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                return value
+            if age < self.ttl + self.stale_ttl:
+                # Serve the stale value now and refresh it in the background
+                task = self._fetch_once(key, fetch)
+                task.add_done_callback(_log_refresh_error(key))
+                return value
+
+        try:
+            return await asyncio.shield(self._fetch_once(key, fetch))
+        except Exception:
+            # Fall back to an expired entry rather than nothing
+            if entry is not None:
+                return entry[0]
+            raise
+
+
+def _log_refresh_error(key):
+    def callback(task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Background refresh failed for '%s': %s", key, task.exception())
+    return callback
+
+
+def build_search_cache():
+    """ResponseCache configured from the SEARCH_CACHE_* environment variables"""
+    if SEARCH_CACHE_PATH:
+        backend = SQLiteBackend(SEARCH_CACHE_PATH)
+    else:
+        backend = MemoryBackend()
+    return ResponseCache(backend)
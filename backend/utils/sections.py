@@ -0,0 +1,160 @@
+"""
+Single-pass resume section segmentation
+
+A section starts right after the first occurrence of its heading (matched
+case-insensitively anywhere in the text) and runs to the next line made of
+letters and spaces only, or to the end of the text. A SectionMap locates
+every known heading of a text once, up front, and then answers all section
+lookups for that text; each section is cut out at most once.
+"""
+
+import re
+from functools import lru_cache
+
+# Alternative headings tried, in order, when a section's own heading is missing
+SECTION_ALTERNATIVES = {
+    'EDUCATION': ['ACADEMIC BACKGROUND', 'EDUCATIONAL QUALIFICATIONS', 'EDUCATION DETAILS', 'QUALIFICATION'],
+    'SKILLS': ['TECHNICAL SKILLS', 'CORE COMPETENCIES', 'TECHNOLOGIES', 'SKILL SET', 'PROGRAMMING'],
+    'EXPERIENCE': ['WORK EXPERIENCE', 'PROFESSIONAL EXPERIENCE', 'WORK HISTORY', 'EMPLOYMENT']
+}
+
+# Headings that show a section is already marked in extracted PDF text
+MARKER_ALTERNATIVES = {
+    'EDUCATION': ['ACADEMIC BACKGROUND', 'EDUCATIONAL QUALIFICATIONS', 'QUALIFICATION', 'DEGREE', 'UNIVERSITY'],
+    'EXPERIENCE': ['WORK HISTORY', 'PROFESSIONAL EXPERIENCE', 'INTERNSHIPS', 'WORK EXPERIENCE', 'EMPLOYMENT'],
+    'SKILLS': ['TECHNICAL SKILLS', 'CORE COMPETENCIES', 'TECHNOLOGIES', 'EXPERTISE', 'PROFICIENCY'],
+    'PROJECTS': ['PROJECT WORK', 'ACADEMIC PROJECTS', 'PERSONAL PROJECTS', 'KEY PROJECTS', 'RESEARCH']
+}
+
+# A line of letters and spaces ends the section before it; anchored on the
+# newline (the rest is lookahead) so the scan skips ahead between newlines
+SECTION_BREAKS = re.compile(r'\n(?=[A-Z][A-Z ]+\n)', re.IGNORECASE)
+
+
+class SectionMap:
+    """Heading positions of one text, and the sections that start at them"""
+
+    def __init__(self, text, heading_ends):
+        """
+        Args:
+            text: The scanned text
+            heading_ends: Upper-case heading -> end offset of its first occurrence
+        """
+        self.text = text
+        self.heading_ends = heading_ends
+        self._sections = {}
+
+    def __contains__(self, heading):
+        return heading.upper() in self.heading_ends
+
+    def heading_text(self, heading):
+        """
+        Text after the first occurrence of a heading, up to the next section break
+
+        Returns:
+            The section text, or None if the heading does not occur
+        """
+        start = self.heading_ends.get(heading.upper())
+        if start is None:
+            return None
+        if start not in self._sections:
+            # Headings can end at the same offset (e.g. 'SKILLS' inside 'TECHNICAL SKILLS')
+            section_break = SECTION_BREAKS.search(self.text, start)
+            end = section_break.start() if section_break else len(self.text)
+            # Like regex '$', the text end is also found just before a final newline
+            if self.text.endswith('\n') and start <= len(self.text) - 1 < end:
+                end = len(self.text) - 1
+            self._sections[start] = self.text[start:end]
+        return self._sections[start]
+
+    def get(self, section_name, alternatives=SECTION_ALTERNATIVES):
+        """
+        Text of a section, found under its own heading or the first alternative present
+
+        Args:
+            section_name: The section to extract (e.g., 'EDUCATION', 'SKILLS')
+            alternatives: Section name -> alternative headings
+
+        Returns:
+            The text content of the section, or empty string if not found
+        """
+        for heading in [section_name] + alternatives.get(section_name, []):
+            section = self.heading_text(heading)
+            if section is not None:
+                return section
+        return ""
+
+    def has_section(self, section_name, alternatives=MARKER_ALTERNATIVES):
+        """Whether the section's heading or any of its alternatives occurs in the text"""
+        return any(heading in self for heading in [section_name] + alternatives.get(section_name, []))
+
+
+class SectionSegmenter:
+    """Finds the first occurrence of each of a fixed set of headings"""
+
+    def __init__(self, headings):
+        """
+        Args:
+            headings: Heading strings to locate; matched case-insensitively
+        """
+        self.headings = sorted({heading.upper() for heading in headings})
+        self._needles = [(heading, heading.lower()) for heading in self.headings]
+        self._patterns = [(heading, re.compile(re.escape(heading), re.IGNORECASE)) for heading in self.headings]
+
+    def scan(self, text):
+        """
+        Locate the headings
+
+        Args:
+            text: The full resume text
+
+        Returns:
+            SectionMap of the text
+        """
+        heading_ends = {}
+        if text.isascii():
+            # One lowercase copy, then a C-level substring search per heading
+            lower = text.lower()
+            for heading, needle in self._needles:
+                position = lower.find(needle)
+                if position != -1:
+                    heading_ends[heading] = position + len(needle)
+        else:
+            # Unicode case folding can change lengths or equate other letters; let the regex decide
+            for heading, pattern in self._patterns:
+                match = pattern.search(text)
+                if match:
+                    heading_ends[heading] = match.end()
+        return SectionMap(text, heading_ends)
+
+
+@lru_cache(maxsize=32)
+def get_segmenter(headings):
+    """Segmenter for a tuple of headings, compiled once"""
+    return SectionSegmenter(headings)
+
+
+def _all_headings(*alternative_maps):
+    headings = []
+    for alternatives in alternative_maps:
+        for section_name, names in alternatives.items():
+            headings.append(section_name)
+            headings.extend(names)
+    return tuple(headings)
+
+
+DEFAULT_HEADINGS = _all_headings(SECTION_ALTERNATIVES, MARKER_ALTERNATIVES)
+
+
+def segment_sections(text, headings=DEFAULT_HEADINGS):
+    """
+    Scan a resume once for its section headings
+
+    Args:
+        text: The full resume text
+        headings: Headings to locate; defaults to every known section and alternative
+
+    Returns:
+        SectionMap of the text
+    """
+    return get_segmenter(tuple(headings)).scan(text)
@@ -0,0 +1,167 @@
+"""
+Multi-pattern string matching for skill extraction
+
+Builds an Aho-Corasick automaton over a set of patterns so that every
+occurrence of every pattern is found in a single pass over the text.
+Uses the pyahocorasick C extension when it is installed and falls back to
+an equivalent pure-Python automaton otherwise.
+"""
+
+from collections import deque
+import importlib.util
+
+
+class _Automaton:
+    """Pure-Python Aho-Corasick automaton with the pyahocorasick interface we use"""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._values = [None]
+        self._outputs = [[]]
+
+    def add_word(self, word, value):
+        """Add a pattern; adding the same word again replaces its value"""
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._values.append(None)
+                self._outputs.append([])
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._values[node] = value
+
+    def make_automaton(self):
+        """Compute failure links and merged outputs (breadth first)"""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+
+        while queue:
+            node = queue.popleft()
+            # Outputs of a node are its own value plus everything its failure state emits
+            own = [self._values[node]] if self._values[node] is not None else []
+            self._outputs[node] = own + self._outputs[self._fail[node]]
+
+            for ch, nxt in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                queue.append(nxt)
+
+    def iter(self, text):
+        """Yield (end_index, value) for every pattern occurrence in text"""
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for value in outputs[node]:
+                yield i, value
+
+
+def build_automaton(patterns):
+    """
+    Compile patterns into an Aho-Corasick automaton
+
+    Args:
+        patterns: Dict mapping each pattern string to the value reported on a match
+
+    Returns:
+        Automaton whose iter(text) yields (end_index, (pattern, value)) tuples
+    """
+    if importlib.util.find_spec("ahocorasick") is not None:
+        import ahocorasick
+        automaton = ahocorasick.Automaton()
+    else:
+        automaton = _Automaton()
+
+    for pattern, value in patterns.items():
+        if pattern:
+            automaton.add_word(pattern, (pattern, value))
+    automaton.make_automaton()
+    return automaton
+
+
+def is_word_char(ch):
+    """Same notion of a word character as the \\w class of the re module"""
+    return ch.isalnum() or ch == '_'
+
+
+def has_word_boundaries(text, start, end):
+    """
+    Check that text[start:end] is delimited like re's \\b...\\b would require
+
+    Args:
+        text: Text the match was found in
+        start: Index of the first matched character
+        end: Index one past the last matched character
+
+    Returns:
+        True if there is a word boundary before start and after end
+    """
+    before = start > 0 and is_word_char(text[start - 1])
+    after = end < len(text) and is_word_char(text[end])
+    return (before != is_word_char(text[start])) and (is_word_char(text[end - 1]) != after)
+
+
+class SubstringIndex:
+    """
+    Answers "which entries contain, or are contained in, this string" without a linear scan
+
+    Entries contained in the query are found by running an Aho-Corasick
+    automaton over the query. Entries containing the query are found through
+    a character n-gram inverted index: every substring of length 1..n of each
+    entry is posted, so short queries are a single lookup and longer ones
+    intersect the postings of their n-grams before a final substring check.
+
+    Results are entry positions, in the order the entries were given.
+    """
+
+    def __init__(self, entries, n=3):
+        self.entries = list(entries)
+        self.n = n
+        self.postings = {}
+        for i, entry in enumerate(self.entries):
+            for size in range(1, n + 1):
+                for start in range(len(entry) - size + 1):
+                    self.postings.setdefault(entry[start:start + size], set()).add(i)
+
+        patterns = {}
+        for i, entry in enumerate(self.entries):
+            patterns.setdefault(entry, []).append(i)
+        self.automaton = build_automaton(patterns)
+
+    def contained_in(self, query):
+        """Positions of entries that occur as a substring of query"""
+        found = set()
+        for _, (_, positions) in self.automaton.iter(query):
+            found.update(positions)
+        return found
+
+    def containing(self, query):
+        """Positions of entries that have query as a substring"""
+        if not query:
+            return set(range(len(self.entries)))
+        if len(query) <= self.n:
+            return set(self.postings.get(query, ()))
+
+        grams = {query[start:start + self.n] for start in range(len(query) - self.n + 1)}
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return {i for i in candidates if query in self.entries[i]}
+
+    def related(self, query):
+        """Positions of entries that contain query or are contained in it"""
+        return self.contained_in(query) | self.containing(query)
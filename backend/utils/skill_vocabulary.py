@@ -0,0 +1,212 @@
+"""
+Precomputed skill vocabulary shared by all extract_skills calls
+
+Everything derived from the skills lists (lowercase lookup, n-gram buckets,
+keyword variation map and the matching automaton) is built once here
+instead of on every request. An optional skills file can extend the
+built-in vocabulary and is picked up without a restart when it changes.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+
+from utils.skill_matcher import build_automaton, SubstringIndex
+
+logger = logging.getLogger(__name__)
+
+
+def tech_keyword_variations(keyword):
+    """Spellings of a tech keyword that OCR commonly produces"""
+    return [
+        keyword,
+        keyword.replace(' ', ''),  # remove spaces
+        keyword.replace('-', ''),  # remove hyphens
+        keyword.replace('.', '')   # remove periods
+    ]
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents, or an empty string if it cannot be read"""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return ''
+
+
+def read_skills_file(path):
+    """
+    Read extra skills from a text file, one skill per line
+
+    Blank lines and lines starting with '#' are ignored.
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith('#')]
+
+
+class SkillVocabulary:
+    """
+    Immutable, precomputed view of a skills list
+
+    Attributes:
+        skills: Skill names in their original casing and order
+        lookup: Lowercase skill -> original skill name
+        ngram_buckets: Word count -> {lowercase skill: original} for n-gram lookups
+        substring_index: SubstringIndex over the lowercase skills
+        variations: OCR keyword variation -> skill it maps to
+        automaton: Aho-Corasick automaton over skills and variations, where each
+            pattern carries a list of (skill, needs_word_boundary) pairs
+        version: Short hash identifying the vocabulary contents
+    """
+
+    def __init__(self, skills, tech_keywords=(), stop_words=()):
+        self.skills = list(skills)
+        self.lookup = {skill.lower(): skill for skill in self.skills}
+
+        self.ngram_buckets = {}
+        for skill, original in self.lookup.items():
+            self.ngram_buckets.setdefault(len(skill.split(' ')), {})[skill] = original
+
+        self._lower_skills = list(self.lookup)
+        self.substring_index = SubstringIndex(self._lower_skills)
+
+        # Each keyword variation maps to the first skill that contains it or is
+        # contained by it, which does not depend on the resume
+        self.variations = {}
+        for keyword in tech_keywords:
+            for var in tech_keyword_variations(keyword):
+                related = self.substring_index.related(var)
+                if related and var not in self.variations:
+                    self.variations[var] = self.lookup[self._lower_skills[min(related)]]
+
+        patterns = {}
+        # Every skill, skipping single characters (too many false positives);
+        # short skills and stop words only count when they are distinct words
+        for skill, original in self.lookup.items():
+            if len(skill) <= 1:
+                continue
+            needs_boundary = len(skill) <= 3 or skill in stop_words
+            patterns.setdefault(skill, []).append((original, needs_boundary))
+        # Keyword variations count as plain substrings
+        for var, original in self.variations.items():
+            candidates = patterns.setdefault(var, [])
+            if (original, False) not in candidates:
+                candidates.append((original, False))
+        self.automaton = build_automaton(patterns)
+
+        digest = hashlib.sha256()
+        for name in self.skills + sorted(self.variations):
+            digest.update(name.encode('utf-8') + b'\0')
+        self.version = digest.hexdigest()[:12]
+
+    def __len__(self):
+        return len(self.lookup)
+
+    def related_skills(self, text):
+        """
+        Skills that equal, contain or are contained in text
+
+        Args:
+            text: Lowercase string such as an entity from the NER pass
+
+        Returns:
+            Set of original skill names
+        """
+        return {self.lookup[self._lower_skills[i]] for i in self.substring_index.related(text)}
+
+
+class ReloadingVocabulary:
+    """
+    Holds the current SkillVocabulary and rebuilds it when the skills file changes
+
+    Every vocabulary it builds gets a ``source_digest`` attribute: the
+    file_digest of the skills file it was built from ('' without one).
+
+    Args:
+        build: Callable taking a list of extra skills and returning a SkillVocabulary
+        path: Optional skills file (see read_skills_file) extending the vocabulary
+        check_interval: Minimum seconds between checks of the file's mtime
+    """
+
+    def __init__(self, build, path=None, check_interval=5.0):
+        self._build = build
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._vocabulary = None
+        self._mtime = None
+        self._checked_at = 0.0
+        self._digest = None
+        self._digest_mtime = None
+        self._digest_checked_at = 0.0
+
+    def _file_mtime(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def reload(self):
+        """
+        Rebuild the vocabulary, re-reading the skills file if configured
+
+        Requests that notice a changed file at the same time all end up here;
+        the mtime is checked again under the lock, so only the first of them
+        rebuilds and the others get its result.
+        """
+        with self._lock:
+            mtime = self._file_mtime() if self.path else None
+            if self._vocabulary is not None and mtime == self._mtime:
+                self._checked_at = time.monotonic()
+                return self._vocabulary
+            extra = []
+            digest = ''
+            if mtime is not None:
+                try:
+                    extra = read_skills_file(self.path)
+                    digest = file_digest(self.path)
+                except OSError as e:
+                    logger.warning("Could not read skills file %s: %s", self.path, e)
+            self._vocabulary = self._build(extra)
+            self._vocabulary.source_digest = digest
+            self._mtime = mtime
+            self._checked_at = time.monotonic()
+            return self._vocabulary
+
+    def get(self):
+        """Return the current vocabulary, building or reloading it if needed"""
+        vocabulary = self._vocabulary
+        if vocabulary is None:
+            return self.reload()
+        if self.path and time.monotonic() - self._checked_at >= self.check_interval:
+            self._checked_at = time.monotonic()
+            if self._file_mtime() != self._mtime:
+                return self.reload()
+        return vocabulary
+
+    def source_digest(self):
+        """
+        Digest of the skills file the vocabulary is currently built from
+
+        Cheap enough for the request path: the vocabulary is not built, and
+        the file is only re-hashed when its mtime changes, checked at most
+        every check_interval seconds.
+
+        Returns:
+            file_digest of the skills file, or '' if none is configured
+        """
+        if not self.path:
+            return ''
+        with self._lock:
+            now = time.monotonic()
+            if self._digest is None or now - self._digest_checked_at >= self.check_interval:
+                mtime = self._file_mtime()
+                if self._digest is None or mtime != self._digest_mtime:
+                    self._digest = file_digest(self.path) if mtime is not None else ''
+                    self._digest_mtime = mtime
+                self._digest_checked_at = now
+            return self._digest
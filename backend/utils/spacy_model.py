@@ -1,11 +1,85 @@
-import spacy
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Components needed for doc.ents; the tagger, parser, lemmatizer etc. are not.
+# The shared tok2vec is only kept when the ner listens to it (see
+# _excluded_components); en_core_web_sm's ner embeds its own tok2vec.
+NER_PIPELINE = ('ner',)
+
+# Factories of components whose output other components can listen to
+EMBEDDING_FACTORIES = ('tok2vec', 'transformer')
+
+
+def _model_config(model_name):
+    """Read the config.cfg of an installed model package or model directory without loading it"""
+    from spacy import util
+
+    path = util.get_package_path(model_name) if util.is_package(model_name) else Path(model_name)
+    # Packages keep their data in a <name>-<version> subdirectory
+    for config_path in [path / 'config.cfg', *sorted(path.glob('*/config.cfg'))]:
+        if config_path.exists():
+            return util.load_config(config_path)
+    raise OSError(f"Can't find spaCy model '{model_name}'")
+
+
+def _listener_upstreams(node):
+    """Upstream names of every Tok2Vec/Transformer listener in a component's model config"""
+    if isinstance(node, dict):
+        if 'Listener' in str(node.get('@architectures', '')):
+            yield node.get('upstream', '*')
+        for value in node.values():
+            yield from _listener_upstreams(value)
+
+
+def _excluded_components(model_name, enable):
+    """
+    Components of a model that are not needed to run the enabled ones
+
+    Embedding components (tok2vec, transformer) stay only if an enabled
+    component listens to them rather than embedding tokens itself.
+    """
+    config = _model_config(model_name)
+    components = config['components']
+    keep = set(enable)
+    for name in enable:
+        for upstream in _listener_upstreams(components.get(name, {}).get('model', {})):
+            if upstream == '*':
+                keep.update(other for other, settings in components.items()
+                            if settings.get('factory') in EMBEDDING_FACTORIES)
+            else:
+                keep.add(upstream)
+    return [name for name in config['nlp']['pipeline'] if name not in keep]
+
+
+def load_spacy_model(model_name='en_core_web_sm', enable=None, allow_download=True):
+    """
+    Load a spaCy pipeline, optionally trimmed to a subset of its components
+
+    Args:
+        model_name: Installed spaCy model package
+        enable: Component names to keep (e.g. NER_PIPELINE); None keeps the full pipeline
+        allow_download: Download the model if it is not installed
+
+    Returns:
+        The loaded Language object
+    """
+    # Imported here so that importing this module stays cheap
+    import spacy
+
+    def load():
+        # Excluded components are never loaded, so their weights cost no time or memory
+        exclude = _excluded_components(model_name, enable) if enable is not None else []
+        return spacy.load(model_name, exclude=exclude)
 
-def load_spacy_model():
     try:
-        return spacy.load('en_core_web_sm')
-    except:
-        print("Downloading en_core_web_sm model...")
+        nlp = load()
+    except OSError:
+        if not allow_download:
+            raise
+        logger.info("Downloading %s model", model_name)
         from spacy.cli import download
-        download('en_core_web_sm')
-        print("heillo")
-        return spacy.load('en_core_web_sm')
\ No newline at end of file
+        download(model_name)
+        nlp = load()
+    return nlp
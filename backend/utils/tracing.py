@@ -0,0 +1,131 @@
+"""
+Structured logging and per-stage tracing spans
+
+span() times a block of the pipeline. Finished spans are logged (at DEBUG,
+as structured fields) and appended to the span list opened by
+collect_spans(), or handed to the sink set with set_span_sink() when no list
+is open. The worker pool returns its span list with each result so the API
+process can feed it into the /metrics latency histograms; spans are plain
+(name, seconds) tuples so they pickle cheaply.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# 'json' for one JSON object per line, 'text' for human-readable lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+# Log to this file instead of stderr
+LOG_FILE = os.getenv("LOG_FILE")
+
+logger = logging.getLogger(__name__)
+
+_spans = contextvars.ContextVar("trace_spans", default=None)
+_parent = contextvars.ContextVar("trace_parent", default=None)
+# Receives spans finished outside collect_spans(), see set_span_sink
+_sink = None
+
+# Attributes every LogRecord has; anything else was passed through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any fields passed with extra="""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level=LOG_LEVEL, log_format=LOG_FORMAT, log_file=LOG_FILE):
+    """Send all loggers to a single stderr (or LOG_FILE) handler in the configured format"""
+    handler = logging.FileHandler(log_file, encoding="utf-8") if log_file else logging.StreamHandler(sys.stderr)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s"))
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+
+
+def set_span_sink(sink):
+    """Send spans finished outside collect_spans() to sink(name, seconds), e.g. a histogram"""
+    global _sink
+    _sink = sink
+
+
+def record_span(name, seconds, **attributes):
+    """Record a finished span measured elsewhere (see span)"""
+    spans = _spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+    elif _sink is not None:
+        _sink(name, seconds)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s took %.1f ms", name, seconds * 1000, extra={
+            "span": name,
+            "parent": _parent.get(),
+            "duration_ms": round(seconds * 1000, 3),
+            "attributes": attributes,
+        })
+
+
+@contextmanager
+def span(name, **attributes):
+    """
+    Time the enclosed block as a named pipeline stage
+
+    Args:
+        name: Stage name, e.g. 'extract_text.pypdf2_page'; it becomes the
+            histogram label, so keep the set of names small and fixed
+        attributes: Extra context for the log entry (page number, sizes, ...)
+    """
+    token = _parent.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        _parent.reset(token)
+        record_span(name, seconds, **attributes)
+
+
+@contextmanager
+def collect_spans():
+    """Collect the spans finished inside the block into the yielded list"""
+    spans = []
+    token = _spans.set(spans)
+    try:
+        yield spans
+    finally:
+        _spans.reset(token)
+
+
+def bind_context(fn):
+    """
+    Wrap fn so that it runs with the caller's tracing context
+
+    Thread pool workers do not inherit context variables; without this, spans
+    finished in them would not reach the caller's collect_spans() list.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # Each call gets its own copy, since one Context cannot be entered by two threads
+        return context.copy().run(fn, *args, **kwargs)
+    return run
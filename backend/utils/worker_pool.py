@@ -0,0 +1,185 @@
+"""
+Process pool for the CPU-bound resume pipeline
+
+Text extraction, OCR, skill extraction and scoring all block, so the upload
+endpoint hands them to a pool of worker processes instead of running them on
+the event loop. Each worker loads the NLP models and the job recommender once
+when it starts. The number of jobs in flight is bounded; once the pool and its
+queue are full, new submissions are rejected so the caller can shed load.
+"""
+
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from utils.pdf_reader import extract_text_from_pdf
+from utils.image_reader import extract_text_from_image
+from utils.extractor import process_resume, extractor_version, get_skill_vocabulary
+from utils.recommender import recommend_jobs, JobIndex, RecommenderEngine
+from utils.model_registry import registry
+from utils.debug_capture import set_request_id, reset_request_id
+from utils.tracing import configure_logging, span, collect_spans
+
+logger = logging.getLogger(__name__)
+
+# Pool size and extra queued jobs; PARSER_WORKERS=0 runs the pipeline in a thread instead
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", str(os.cpu_count() or 1)))
+PARSER_QUEUE_SIZE = int(os.getenv("PARSER_QUEUE_SIZE", str(2 * max(PARSER_WORKERS, 1))))
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+
+# Per-process recommender, set up by init_worker
+_recommender = None
+
+
+class PoolSaturatedError(Exception):
+    """Raised when the pool and its queue are full"""
+
+
+def init_worker(dataset_path, preload_models=True):
+    """
+    Prepare a worker process: build the recommender and load the NLP models
+
+    Args:
+        dataset_path: Path to job_skill_dataset.csv
+        preload_models: Load every registered model now rather than on first use
+    """
+    global _recommender
+    # Spawned workers start without the parent's logging configuration
+    configure_logging()
+    _recommender = RecommenderEngine(JobIndex.load(dataset_path))
+    if preload_models:
+        for name in registry.status():
+            try:
+                registry.get(name)
+            except Exception as e:
+                # The model will be retried lazily on first use
+                logger.warning("Could not preload %s in worker %d: %s", name, os.getpid(), e)
+
+
+def parse_and_recommend(file_source, file_extension, request_id=None):
+    """
+    Full resume pipeline: extract text, analyze it and recommend jobs
+
+    Args:
+        file_source: Uploaded file as bytes (or a path / binary file-like object)
+        file_extension: Lowercase extension including the dot, e.g. '.pdf'
+        request_id: Id that debug artifacts of this run are filed under
+
+    Returns:
+        Dict with extractedInfo, recommendedJobs, extractorVersion (the
+        extractor_version this parse used), textBackends (pages handled per
+        text backend) and spans (the (stage, seconds) timings of this run),
+        or None if no text could be extracted
+    """
+    token = set_request_id(request_id)
+    try:
+        with collect_spans() as spans:
+            output_data = _parse_and_recommend(file_source, file_extension)
+        if output_data is not None:
+            output_data['spans'] = spans
+        return output_data
+    finally:
+        reset_request_id(token)
+
+
+def _parse_and_recommend(file_source, file_extension):
+    page_report = []
+    if file_extension == '.pdf':
+        with span('extract_text.pdf'):
+            text = extract_text_from_pdf(file_source, page_report=page_report)
+    elif file_extension in IMAGE_EXTENSIONS:
+        with span('extract_text.image'):
+            text = extract_text_from_image(file_source)
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+    if not text:
+        return None
+
+    # Process the resume, noting the version of the vocabulary it runs with
+    with span('process_resume'):
+        version = extractor_version(get_skill_vocabulary())
+        info = process_resume(text)
+
+    # Get job recommendations from this worker's prefitted recommender
+    with span('recommend'):
+        recommended_jobs = recommend_jobs(info['Skills'], _recommender)
+    logger.debug("Recommended %d jobs", len(recommended_jobs))
+
+    return {
+        'extractedInfo': info,
+        'recommendedJobs': recommended_jobs,
+        'extractorVersion': version,
+        'textBackends': dict(Counter(page['backend'] for page in page_report))
+    }
+
+
+class ParserPool:
+    """
+    Bounded executor for parse_and_recommend and similar pipeline functions
+
+    Args:
+        dataset_path: Path to job_skill_dataset.csv, loaded by every worker
+        workers: Number of worker processes; 0 runs jobs in a thread of this process
+        queue_size: Jobs allowed to wait for a free worker before submissions are rejected
+    """
+
+    def __init__(self, dataset_path, workers=PARSER_WORKERS, queue_size=PARSER_QUEUE_SIZE):
+        self.workers = workers
+        self.capacity = max(workers, 1) + queue_size
+        self.in_flight = 0
+
+        if workers > 0:
+            # spawn rather than fork: the server process has running threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(str(dataset_path),)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(thread_name_prefix="parser")
+            init_worker(str(dataset_path), preload_models=False)
+
+    async def submit(self, fn, *args):
+        """
+        Run fn(*args) in the pool and wait for the result without blocking the event loop
+
+        The job keeps its slot until it has actually finished: if the caller is
+        cancelled (e.g. the client disconnects) while the job is running, the
+        slot is only freed when the worker is done with it.
+
+        Raises:
+            PoolSaturatedError: If the pool and its queue are already full
+        """
+        # Only touched from the event loop thread, so a plain counter is enough
+        if self.in_flight >= self.capacity:
+            raise PoolSaturatedError(f"Parser pool is saturated ({self.in_flight} jobs in flight)")
+
+        loop = asyncio.get_running_loop()
+        if self.workers > 0:
+            future = self._executor.submit(fn, *args)
+        else:
+            # Like asyncio.to_thread, run in a copy of the caller's context
+            future = self._executor.submit(contextvars.copy_context().run, fn, *args)
+        self.in_flight += 1
+        future.add_done_callback(lambda _: self._release(loop))
+        return await asyncio.wrap_future(future, loop=loop)
+
+    def _release(self, loop):
+        """Done callback of a job; runs in an executor thread, so hand the decrement to the loop"""
+        def release():
+            self.in_flight -= 1
+        try:
+            loop.call_soon_threadsafe(release)
+        except RuntimeError:
+            # The loop is already closed, so nobody counts slots anymore
+            pass
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)